@@ -9,6 +9,7 @@ from alembic import context
 from sqlalchemy import engine_from_config, pool, text
 
 sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from app import models  # noqa: E402,F401
 from app.database import Base  # noqa: E402
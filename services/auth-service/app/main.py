@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import json
 import logging
 import uuid
-from contextvars import ContextVar
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import make_asgi_app
+from servicekit.logging import parse_sampling, request_id_ctx, setup_logging
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from . import security
 from .api import router as auth_router
@@ -17,44 +18,36 @@ from .database import async_session_factory
 from .seed import seed_initial_data
 from .settings import get_settings
 
-request_id_ctx = ContextVar("request_id", default="")
 
+class RequestIDMiddleware:
+    """Tag each request with an ``X-Request-ID`` and log it."""
 
-class RequestIdFilter(logging.Filter):
-    def filter(self, record: logging.LogRecord) -> bool:
-        record.request_id = request_id_ctx.get()
-        return True
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-class JsonFormatter(logging.Formatter):
-    def format(
-        self, record: logging.LogRecord
-    ) -> str:  # pragma: no cover - simple formatting
-        log: dict[str, object] = {
-            "level": record.levelname,
-            "message": record.getMessage(),
-        }
-        if getattr(record, "request_id", ""):
-            log["request_id"] = record.request_id
-        for attr in ("method", "path", "status_code"):
-            if hasattr(record, attr):
-                log[attr] = getattr(record, attr)
-        return json.dumps(log)
+        request_id = Headers(scope=scope).get("X-Request-ID") or str(uuid.uuid4())
+        request_id_ctx.set(request_id)
+        logger = logging.getLogger("auth-service")
+        logger.info("request", extra={"method": scope["method"], "path": scope["path"]})
 
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+                logger.info("response", extra={"status_code": message["status"]})
+            await send(message)
 
-def setup_logging() -> None:
-    handler = logging.StreamHandler()
-    handler.setFormatter(JsonFormatter())
-    handler.addFilter(RequestIdFilter())
-    root = logging.getLogger()
-    root.handlers = [handler]
-    root.setLevel(logging.INFO)
+        await self.app(scope, receive, send_with_request_id)
 
 
-setup_logging()
-
 settings = get_settings()
 
+setup_logging(parse_sampling(settings.log_sampling))
+
 app = FastAPI()
 app.add_middleware(
     CORSMiddleware,
@@ -63,22 +56,11 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestIDMiddleware)
 metrics_app = make_asgi_app()
 app.mount("/metrics", metrics_app)
 
 
-@app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
-    request_id_ctx.set(request_id)
-    logger = logging.getLogger("auth-service")
-    logger.info("request", extra={"method": request.method, "path": request.url.path})
-    response = await call_next(request)
-    response.headers["X-Request-ID"] = request_id
-    logger.info("response", extra={"status_code": response.status_code})
-    return response
-
-
 try:  # pragma: no cover - optional tracing
     from opentelemetry.instrumentation.fastapi import (  # type: ignore
         FastAPIInstrumentor,
@@ -28,6 +28,12 @@ _DEFAULT_PRIVATE_KEY, _DEFAULT_PUBLIC_KEY = _generate_keypair()
 
 
 class Settings(BaseSettings):
+    db_pool_size: int = Field(5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30.0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(False, alias="DB_POOL_PRE_PING")
+    db_statement_cache_size: int = Field(100, alias="DB_STATEMENT_CACHE_SIZE")
     database_url: AnyUrl = Field("sqlite:///./auth.db", alias="DATABASE_URL")
     jwt_private_key: str = Field(_DEFAULT_PRIVATE_KEY, alias="JWT_PRIVATE_KEY")
     jwt_public_key: str = Field(_DEFAULT_PUBLIC_KEY, alias="JWT_PUBLIC_KEY")
@@ -38,6 +44,7 @@ class Settings(BaseSettings):
     password_pepper: str | None = Field("", alias="PASSWORD_PEPPER")
     redis_url: str | None = Field(None, alias="REDIS_URL")
     cors_allow_origins: List[str] = Field(["*"], alias="CORS_ALLOW_ORIGINS")
+    log_sampling: str = Field("", alias="LOG_SAMPLING")
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -14,6 +14,9 @@ from httpx import AsyncClient
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 
+# The shared ``servicekit`` package sits next to the service directories.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
 
 @pytest.fixture(scope="function")
 def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
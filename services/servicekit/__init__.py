@@ -0,0 +1,5 @@
+"""Helpers shared by the Python services.
+
+The services import this package from the ``services`` directory; each image
+copies it next to its ``app`` package.
+"""
@@ -0,0 +1,72 @@
+"""Prometheus metrics of the SQLAlchemy connection pools."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+
+from prometheus_client import REGISTRY, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool, QueuePool
+
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time spent obtaining a database connection from the pool",
+    ["pool"],
+)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waits."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(pool=self.name).observe(time.perf_counter() - start)
+
+    @property
+    def name(self) -> str:
+        return self.logging_name or "primary"
+
+
+class DatabasePoolCollector(Collector):
+    """Report the state of the SQLAlchemy connection pools at scrape time.
+
+    Pools are looked up by name on every scrape, so adding the pool of a new
+    engine under an existing name replaces the one of the engine it follows.
+    """
+
+    def __init__(self) -> None:
+        self._pools: dict[str, Pool] = {}
+
+    def add(self, name: str, pool: Pool) -> None:
+        self._pools[name] = pool
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        connections = GaugeMetricFamily(
+            "db_pool_connections",
+            "Connections held by the database pool",
+            labels=["pool", "state"],
+        )
+        overflow = GaugeMetricFamily(
+            "db_pool_overflow",
+            "Connections opened beyond the database pool size",
+            labels=["pool"],
+        )
+        for name, pool in self._pools.items():
+            if not isinstance(pool, QueuePool):
+                continue
+            connections.add_metric([name, "checked_out"], pool.checkedout())
+            connections.add_metric([name, "idle"], pool.checkedin())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+        yield connections
+        yield overflow
+
+
+DB_POOL = DatabasePoolCollector()
+REGISTRY.register(DB_POOL)
+
+__all__ = ["DB_POOL", "DB_POOL_WAIT", "DatabasePoolCollector", "TimedQueuePool"]
@@ -0,0 +1,166 @@
+"""JSON logging written from a background thread."""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import zlib
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Mapping
+
+try:  # pragma: no cover - optional faster encoder
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+request_id_ctx: ContextVar[str] = ContextVar("request_id", default="")
+
+
+def dumps(data: Mapping[str, Any]) -> str:
+    """Encode a log entry, with ``orjson`` when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """Copy the request id onto the record before it leaves the request."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_ctx.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of the records below ``WARNING`` of some loggers.
+
+    ``rates`` maps logger names to the fraction to keep; child loggers inherit
+    the rate of their closest configured parent, so ``uvicorn=0.1`` also
+    samples ``uvicorn.access``. Records of the same request are kept or
+    dropped together, so request and response lines stay paired.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        super().__init__()
+        self.rates = dict(rates)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1:
+            return True
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            return zlib.crc32(str(request_id).encode()) / 2**32 < rate
+        return random.random() < rate
+
+    def _rate(self, name: str) -> float:
+        while True:
+            rate = self.rates.get(name)
+            if rate is not None:
+                return rate
+            if "." not in name:
+                return 1.0
+            name = name.rpartition(".")[0]
+
+
+def parse_sampling(value: str) -> dict[str, float]:
+    """Parse ``"logger=rate,other=rate"`` into a mapping of sampling rates."""
+    rates: dict[str, float] = {}
+    for item in value.split(","):
+        name, sep, rate = item.partition("=")
+        if sep and name.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    def format(
+        self, record: logging.LogRecord
+    ) -> str:  # pragma: no cover - simple formatting
+        log: dict[str, object] = {
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", "")
+        if request_id:
+            log["request_id"] = request_id
+        for attr in ("method", "path", "status_code"):
+            if hasattr(record, attr):
+                log[attr] = getattr(record, attr)
+        if record.exc_info:
+            log["exc_info"] = self.formatException(record.exc_info)
+        return dumps(log)
+
+
+class _QueueHandler(QueueHandler):
+    """Hand records to the listener thread without formatting them."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message now, since its arguments may change after the
+        # call returns, and leave encoding and output to the listener.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+_listener: QueueListener | None = None
+
+
+def setup_logging(
+    sampling: Mapping[str, float] | None = None,
+    *,
+    level: int | str = logging.INFO,
+    formatter: logging.Formatter | None = None,
+    context_filter: logging.Filter | None = None,
+) -> None:
+    """Send records through a queue to a stderr writer thread.
+
+    ``context_filter`` runs on the logging thread, before the record is
+    queued, and copies the request context onto it; it defaults to
+    :class:`RequestIdFilter`. Records are formatted with ``formatter``,
+    :class:`JsonFormatter` by default, on the writer thread, so a slow log
+    consumer never blocks the event loop.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+
+    stream = logging.StreamHandler()
+    stream.setFormatter(formatter or JsonFormatter())
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(context_filter or RequestIdFilter())
+    if sampling:
+        handler.addFilter(SamplingFilter(sampling))
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(level)
+
+
+@atexit.register
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+__all__ = [
+    "JsonFormatter",
+    "RequestIdFilter",
+    "SamplingFilter",
+    "dumps",
+    "parse_sampling",
+    "request_id_ctx",
+    "setup_logging",
+]
@@ -8,6 +8,7 @@ from alembic import context
 from sqlalchemy import engine_from_config, pool, text
 
 sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 
 from app.core.database import Base  # noqa: E402
 from app.domain import models  # noqa: E402,F401
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0003_project_task_counters"
+down_revision = "0002_task_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    schema = "tasks" if dialect != "sqlite" else None
+    prefix = f"{schema}." if schema else ""
+
+    op.create_table(
+        "project_task_counters",
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey(f"{prefix}projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("last_value", sa.Integer(), nullable=False, server_default="0"),
+        schema=schema,
+    )
+    # Continue after the highest number in use. The task count is not enough:
+    # once a task is deleted it is lower than the newest ``SLUG-N``. Codes
+    # without a numeric suffix are ignored.
+    if dialect == "sqlite":
+        number = "CAST(substr(t.code, length(p.slug) + 2) AS INTEGER)"
+    else:
+        number = "CAST(substring(t.code FROM '-([0-9]+)$') AS INTEGER)"
+    op.execute(
+        f"INSERT INTO {prefix}project_task_counters (project_id, last_value) "
+        f"SELECT p.id, COALESCE(MAX({number}), 0) FROM {prefix}projects p "
+        f"LEFT JOIN {prefix}tasks t ON t.project_id = p.id GROUP BY p.id"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    schema = "tasks" if bind.dialect.name != "sqlite" else None
+
+    op.drop_table("project_task_counters", schema=schema)
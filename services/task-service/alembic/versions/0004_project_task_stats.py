@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0004_project_task_stats"
+down_revision = "0003_project_task_counters"
+branch_labels = None
+depends_on = None
+
+STATUSES = ("pending", "in_progress", "completed")
+LEVELS = ("low", "medium", "high")
+
+
+def _counts(column: str, values: tuple[str, ...]) -> str:
+    pairs = ", ".join(
+        f"'{value}', COUNT(t.id) FILTER (WHERE t.{column} = '{value}')"
+        for value in values
+    )
+    return f"jsonb_build_object({pairs})"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    dialect = bind.dialect.name
+    schema = "tasks" if dialect != "sqlite" else None
+    prefix = f"{schema}." if schema else ""
+
+    op.create_table(
+        "project_task_stats",
+        sa.Column(
+            "project_id",
+            sa.Integer(),
+            sa.ForeignKey(f"{prefix}projects.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("by_status", postgresql.JSONB(), nullable=True),
+        sa.Column("by_priority", postgresql.JSONB(), nullable=True),
+        sa.Column("by_complexity", postgresql.JSONB(), nullable=True),
+        sa.Column("overdue", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "completed_this_week", sa.Integer(), nullable=False, server_default="0"
+        ),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=True),
+        schema=schema,
+    )
+    if dialect == "postgresql":
+        # Same aggregate as ProjectStatsRepository.refresh; the reconciler
+        # keeps the time-dependent columns current from then on.
+        op.execute(
+            f"INSERT INTO {prefix}project_task_stats "
+            "(project_id, total, by_status, by_priority, by_complexity, overdue, "
+            "completed_this_week, refreshed_at) "
+            f"SELECT p.id, COUNT(t.id), {_counts('status', STATUSES)}, "
+            f"{_counts('priority', LEVELS)}, "
+            f"{_counts('complexity', LEVELS)}, "
+            "COUNT(t.id) FILTER (WHERE t.completed_at IS NULL "
+            "AND t.due_date < timezone('utc', now())), "
+            "COUNT(t.id) FILTER (WHERE t.completed_at >= "
+            "date_trunc('week', timezone('utc', now()))), "
+            "timezone('utc', now()) "
+            f"FROM {prefix}projects p "
+            f"LEFT JOIN {prefix}tasks t ON t.project_id = p.id GROUP BY p.id"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    schema = "tasks" if bind.dialect.name != "sqlite" else None
+
+    op.drop_table("project_task_stats", schema=schema)
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from datetime import date, datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = "0005_partition_activity_logs"
+down_revision = "0004_project_task_stats"
+branch_labels = None
+depends_on = None
+
+# Monthly partitions created past the current month; the maintenance job
+# keeps this many ahead from then on.
+MONTHS_AHEAD = 3
+
+COLUMNS = "id, task_id, action, performed_by, details, created_at"
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    existing = sa.inspect(bind).has_table("activity_logs", schema="tasks")
+    if existing:
+        op.execute(
+            "ALTER TABLE tasks.activity_logs RENAME TO activity_logs_unpartitioned"
+        )
+        op.execute("ALTER SEQUENCE tasks.activity_logs_id_seq OWNED BY NONE")
+    else:
+        op.execute("CREATE SEQUENCE tasks.activity_logs_id_seq")
+
+    op.execute(
+        "CREATE TABLE tasks.activity_logs ("
+        "id integer NOT NULL DEFAULT nextval('tasks.activity_logs_id_seq'), "
+        "task_id integer REFERENCES tasks.tasks (id) ON DELETE SET NULL, "
+        "action varchar NOT NULL, "
+        "performed_by integer, "
+        "details jsonb, "
+        "created_at timestamp NOT NULL, "
+        "PRIMARY KEY (id, created_at)"
+        ") PARTITION BY RANGE (created_at)"
+    )
+    op.execute(
+        "ALTER SEQUENCE tasks.activity_logs_id_seq OWNED BY tasks.activity_logs.id"
+    )
+    # Created on the parent, so every partition gets its own copy.
+    op.execute(
+        "CREATE INDEX ix_activity_logs_task_id_created_at "
+        "ON tasks.activity_logs (task_id, created_at DESC)"
+    )
+    op.execute(
+        "CREATE TABLE tasks.activity_logs_default "
+        "PARTITION OF tasks.activity_logs DEFAULT"
+    )
+
+    today = datetime.utcnow().date()
+    first = date(today.year, today.month, 1)
+    if existing:
+        oldest = bind.execute(
+            sa.text("SELECT min(created_at) FROM tasks.activity_logs_unpartitioned")
+        ).scalar()
+        if oldest is not None and oldest.date() < first:
+            first = date(oldest.year, oldest.month, 1)
+    month = first
+    last = today
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(date(last.year, last.month, 1))
+    while month <= last:
+        following = _next_month(month)
+        op.execute(
+            f"CREATE TABLE tasks.activity_logs_p{month:%Y_%m} "
+            "PARTITION OF tasks.activity_logs FOR VALUES "
+            f"FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+
+    if existing:
+        op.execute(
+            f"INSERT INTO tasks.activity_logs ({COLUMNS}) "
+            "SELECT id, task_id, action, performed_by, details, "
+            "COALESCE(created_at, now()) FROM tasks.activity_logs_unpartitioned"
+        )
+        op.execute("DROP TABLE tasks.activity_logs_unpartitioned")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE tasks.activity_logs RENAME TO activity_logs_partitioned")
+    op.execute("ALTER SEQUENCE tasks.activity_logs_id_seq OWNED BY NONE")
+    op.execute(
+        "CREATE TABLE tasks.activity_logs ("
+        "id integer PRIMARY KEY DEFAULT nextval('tasks.activity_logs_id_seq'), "
+        "task_id integer REFERENCES tasks.tasks (id) ON DELETE SET NULL, "
+        "action varchar NOT NULL, "
+        "performed_by integer, "
+        "details jsonb, "
+        "created_at timestamp"
+        ")"
+    )
+    op.execute(
+        "ALTER SEQUENCE tasks.activity_logs_id_seq OWNED BY tasks.activity_logs.id"
+    )
+    op.execute(
+        f"INSERT INTO tasks.activity_logs ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM tasks.activity_logs_partitioned"
+    )
+    op.execute("DROP TABLE tasks.activity_logs_partitioned")
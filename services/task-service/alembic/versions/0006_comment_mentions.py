@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision = "0006_comment_mentions"
+down_revision = "0005_partition_activity_logs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    if not sa.inspect(bind).has_table("comments", schema="tasks"):
+        return
+
+    op.add_column(
+        "comments",
+        sa.Column(
+            "mentions",
+            postgresql.JSONB(),
+            nullable=False,
+            server_default=sa.text("'[]'::jsonb"),
+        ),
+        schema="tasks",
+    )
+    # Same rule as app.services.comments.parse_mentions: distinct names in
+    # order of first appearance.
+    op.execute(
+        "UPDATE tasks.comments c SET mentions = m.names FROM ("
+        "SELECT id, jsonb_agg(name ORDER BY first) AS names FROM ("
+        "SELECT c2.id, r.match[1] AS name, min(r.ord) AS first "
+        "FROM tasks.comments c2, "
+        "regexp_matches(c2.content, '@([A-Za-z0-9_]+)', 'g') "
+        "WITH ORDINALITY AS r(match, ord) "
+        "GROUP BY c2.id, r.match[1]"
+        ") found GROUP BY id"
+        ") m WHERE m.id = c.id"
+    )
+    op.create_index(
+        "ix_comments_mentions",
+        "comments",
+        ["mentions"],
+        postgresql_using="gin",
+        postgresql_ops={"mentions": "jsonb_path_ops"},
+        schema="tasks",
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    if not sa.inspect(bind).has_table("comments", schema="tasks"):
+        return
+
+    op.drop_index("ix_comments_mentions", table_name="comments", schema="tasks")
+    op.drop_column("comments", "mentions", schema="tasks")
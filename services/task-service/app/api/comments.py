@@ -2,13 +2,11 @@
 
 from __future__ import annotations
 
-import re
-
 from fastapi import APIRouter, Depends, Query, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_session
 from ..domain.schemas import CommentCreate, CommentRead
 from ..services import CommentService
 
@@ -24,12 +22,6 @@ class CommentCreateBody(BaseModel):
     author_id: int | None = None
 
 
-def parse_mentions(text: str) -> list[str]:
-    """Extract ``@user`` mentions from ``text``."""
-
-    return re.findall(r"@([A-Za-z0-9_]+)", text)
-
-
 @router.post(
     "/tasks/{task_id}/comments",
     response_model=CommentRead,
@@ -43,8 +35,7 @@ async def create_comment(
 ) -> CommentRead:
     data = comment_in.model_dump()
     comment = await service.create(session, CommentCreate(task_id=task_id, **data))
-    base = CommentRead.model_validate(comment)
-    return base.model_copy(update={"mentions": parse_mentions(base.content)})
+    return CommentRead.model_validate(comment)
 
 
 @router.get(
@@ -55,15 +46,29 @@ async def list_comments(
     task_id: int,
     offset: int = 0,
     limit: int = Query(100, ge=1),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     service: CommentService = Depends(get_comment_service),
 ) -> dict[str, list[CommentRead]]:
     comments = await service.list_by_task(session, task_id, offset=offset, limit=limit)
-    data: list[CommentRead] = []
-    for comment in comments:
-        base = CommentRead.model_validate(comment)
-        data.append(base.model_copy(update={"mentions": parse_mentions(base.content)}))
-    return {"comments": data}
+    return {"comments": [CommentRead.model_validate(c) for c in comments]}
+
+
+@router.get(
+    "/mentions/{username}",
+    response_model=dict[str, list[CommentRead]],
+)
+async def list_mentions(
+    username: str,
+    offset: int = 0,
+    limit: int = Query(100, ge=1),
+    session: AsyncSession = Depends(get_read_session),
+    service: CommentService = Depends(get_comment_service),
+) -> dict[str, list[CommentRead]]:
+    """List the comments mentioning ``username``, newest first."""
+    comments = await service.list_mentioning(
+        session, username, offset=offset, limit=limit
+    )
+    return {"comments": [CommentRead.model_validate(c) for c in comments]}
 
 
 __all__ = ["router"]
@@ -2,11 +2,12 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_session
+from ..core.etag import if_none_match, not_modified, weak_etag
 from ..domain.schemas import ListCreate, ListRead
 from ..services import ListService
 
@@ -47,15 +48,23 @@ async def create_list(
 @router.get(
     "/projects/{project_id}/lists",
     response_model=dict[str, list[ListRead]],
+    responses={304: {"description": "Not modified"}},
 )
 async def list_lists(
+    request: Request,
+    response: Response,
     project_id: int,
     offset: int = 0,
     limit: int = Query(100, ge=1),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     service: ListService = Depends(get_list_service),
-) -> dict[str, list[ListRead]]:
+) -> dict[str, list[ListRead]] | Response:
     """List lists for a project."""
+    count, updated_at = await service.fingerprint(session, project_id)
+    etag = weak_etag("lists", project_id, count, updated_at, offset, limit)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     lists = await service.list_by_project(
         session, project_id, offset=offset, limit=limit
     )
@@ -3,17 +3,29 @@
 from __future__ import annotations
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_session
+from ..core.etag import if_none_match, not_modified, weak_etag
+from ..core.http import get_http_client, service_url
+from ..core.permissions import invalidate_project_role
 from ..core.settings import settings
 from ..domain.schemas import (
     ProjectCreate,
     ProjectMemberRead,
     ProjectMemberUpdate,
     ProjectRead,
+    ProjectStatsRead,
 )
 from ..services import ProjectService
 
@@ -29,6 +41,10 @@ class ProjectUpdate(BaseModel):
     slug: str | None = None
 
 
+def _members_url(path: str) -> str:
+    return service_url(str(settings.user_service_base_url), path)
+
+
 @router.post("/", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
 async def create_project(
     project_in: ProjectCreate,
@@ -44,7 +60,7 @@ async def create_project(
 async def list_projects(
     offset: int = 0,
     limit: int = Query(100, ge=1),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     service: ProjectService = Depends(get_project_service),
 ) -> dict[str, list[ProjectRead]]:
     """List projects."""
@@ -53,21 +69,49 @@ async def list_projects(
     return {"projects": data}
 
 
-@router.get("/{project_id}", response_model=ProjectRead)
+@router.get(
+    "/{project_id}",
+    response_model=ProjectRead,
+    responses={304: {"description": "Not modified"}},
+)
 async def get_project(
+    request: Request,
+    response: Response,
     project_id: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     service: ProjectService = Depends(get_project_service),
-) -> ProjectRead:
+) -> ProjectRead | Response:
     """Retrieve a project by its ID."""
     project = await service.get(session, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
         )
+    etag = weak_etag("project", project.id, project.updated_at.isoformat())
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     return ProjectRead.model_validate(project)
 
 
+@router.get("/{project_id}/stats", response_model=ProjectStatsRead)
+async def get_project_stats(
+    project_id: int,
+    session: AsyncSession = Depends(get_read_session),
+    service: ProjectService = Depends(get_project_service),
+) -> ProjectStatsRead:
+    """Return the task summary of a project for dashboards.
+
+    The summary is kept current by every task write, so this reads one row.
+    """
+    summary = await service.stats_summary(session, project_id)
+    if not summary:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+        )
+    return ProjectStatsRead.model_validate(summary)
+
+
 @router.patch("/{project_id}", response_model=ProjectRead)
 async def update_project(
     project_id: int,
@@ -86,15 +130,14 @@ async def update_project(
 
 
 @router.get("/{project_id}/members", response_model=dict[str, list[ProjectMemberRead]])
-async def list_members(project_id: int) -> dict[str, list[ProjectMemberRead]]:
+async def list_members(
+    project_id: int, client: httpx.AsyncClient = Depends(get_http_client)
+) -> dict[str, list[ProjectMemberRead]]:
     """List members of a project.
 
     This endpoint proxies the request to the user service.
     """
-    async with httpx.AsyncClient(
-        base_url=str(settings.user_service_base_url)
-    ) as client:
-        resp = await client.get(f"/projects/{project_id}/members")
+    resp = await client.get(_members_url(f"/projects/{project_id}/members"))
     if resp.status_code == status.HTTP_404_NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
@@ -114,37 +157,40 @@ async def put_member(
     project_id: int,
     user_id: int,
     member_in: ProjectMemberUpdate,
+    client: httpx.AsyncClient = Depends(get_http_client),
 ) -> ProjectMemberRead:
     """Add or update a project member by delegating to the user service."""
-    async with httpx.AsyncClient(
-        base_url=str(settings.user_service_base_url)
-    ) as client:
-        resp = await client.put(
-            f"/projects/{project_id}/members/{user_id}",
-            json=member_in.model_dump(),
-        )
+    resp = await client.put(
+        _members_url(f"/projects/{project_id}/members/{user_id}"),
+        json=member_in.model_dump(),
+    )
     if resp.status_code == status.HTTP_404_NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
         )
     resp.raise_for_status()
+    invalidate_project_role(project_id, user_id)
     return ProjectMemberRead.model_validate(resp.json())
 
 
 @router.delete(
     "/{project_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT
 )
-async def delete_member(project_id: int, user_id: int) -> Response:
+async def delete_member(
+    project_id: int,
+    user_id: int,
+    client: httpx.AsyncClient = Depends(get_http_client),
+) -> Response:
     """Remove a project member via the user service."""
-    async with httpx.AsyncClient(
-        base_url=str(settings.user_service_base_url)
-    ) as client:
-        resp = await client.delete(f"/projects/{project_id}/members/{user_id}")
+    resp = await client.delete(
+        _members_url(f"/projects/{project_id}/members/{user_id}")
+    )
     if resp.status_code == status.HTTP_404_NOT_FOUND:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Member not found"
         )
     resp.raise_for_status()
+    invalidate_project_role(project_id, user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -2,23 +2,46 @@
 
 from __future__ import annotations
 
+import codecs
+import io
+import logging
+import tempfile
+import time
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, model_validator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from ..core.database import get_session
+from ..core.database import get_read_session, get_read_session_factory, get_session
+from ..core.etag import if_none_match, not_modified, weak_etag
+from ..core.pagination import InvalidCursorError
+from ..core.responses import ModelResponse
+from ..core.settings import settings
 from ..domain.schemas import (
+    BoardResponse,
     Complexity,
     ErrorResponse,
+    Pagination,
     Priority,
+    SearchMode,
     Status,
+    TaskBatchResponse,
+    TaskBatchUpdateResponse,
     TaskCreate,
+    TaskFileFormat,
+    TaskImportReport,
     TaskListResponse,
     TaskRead,
 )
-from ..services import TaskService
+from ..services import TaskImporter, TaskService
+from ..services.imports import ProjectNotFoundError, read_rows
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["tasks"])
 
@@ -27,6 +50,10 @@ def get_task_service() -> TaskService:
     return TaskService()
 
 
+def get_task_importer() -> TaskImporter:
+    return TaskImporter()
+
+
 class TaskCreateBody(BaseModel):
     list_id: int | None = None
     title: str
@@ -61,6 +88,48 @@ class MoveTaskBody(BaseModel):
     list_id: int
 
 
+class TaskPatchItem(BaseModel):
+    id: int
+    patch: TaskUpdate
+
+
+class TaskBatchUpdateBody(BaseModel):
+    """Either one ``patch`` applied to all ``ids`` or per-id ``items``."""
+
+    ids: list[int] | None = Field(None, min_length=1, max_length=1000)
+    patch: TaskUpdate | None = None
+    items: list[TaskPatchItem] | None = Field(None, min_length=1, max_length=1000)
+
+    @model_validator(mode="after")
+    def check_mode(self) -> "TaskBatchUpdateBody":
+        if (self.ids is None) == (self.items is None):
+            raise ValueError("Provide either ids and patch or items")
+        if self.ids is not None and self.patch is None:
+            raise ValueError("patch is required with ids")
+        return self
+
+
+class TaskIdsBody(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=1000)
+
+
+class MoveTasksBody(TaskIdsBody):
+    list_id: int
+
+
+class TaskBatchBody(BaseModel):
+    # Items are validated one by one so a bad item does not reject the batch.
+    tasks: list[dict[str, Any]] = Field(min_length=1, max_length=1000)
+
+
+def _invalid_cursor(exc: InvalidCursorError) -> HTTPException:
+    # ``list_tasks`` shadows the ``status`` module with its query parameter.
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=ErrorResponse(code="INVALID_CURSOR", message=str(exc)).model_dump(),
+    )
+
+
 @router.post(
     "/projects/{project_id}/tasks",
     response_model=TaskRead,
@@ -71,17 +140,105 @@ async def create_task(
     task_in: TaskCreateBody,
     session: AsyncSession = Depends(get_session),
     service: TaskService = Depends(get_task_service),
-) -> TaskRead:
+) -> ModelResponse:
     data = task_in.model_dump()
     task = await service.create(session, TaskCreate(project_id=project_id, **data))
-    return task
+    return ModelResponse(task, status_code=status.HTTP_201_CREATED)
+
+
+@router.post(
+    "/projects/{project_id}/tasks:batch",
+    response_model=TaskBatchResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def create_tasks_batch(
+    project_id: int,
+    body: TaskBatchBody,
+    session: AsyncSession = Depends(get_session),
+    service: TaskService = Depends(get_task_service),
+) -> ModelResponse:
+    try:
+        tasks, errors = await service.create_many(session, project_id, body.tasks)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ErrorResponse(
+                code="PROJECT_NOT_FOUND", message="Project not found"
+            ).model_dump(),
+        ) from exc
+    return ModelResponse(TaskBatchResponse.model_construct(tasks=tasks, errors=errors))
+
+
+# Uploads larger than this are spooled to a temporary file.
+IMPORT_SPOOL_SIZE = 8 * 1024 * 1024
+
+
+@router.post(
+    "/projects/{project_id}/tasks:import",
+    response_model=TaskImportReport,
+    responses={404: {"model": ErrorResponse}, 422: {"model": ErrorResponse}},
+)
+async def import_tasks(
+    request: Request,
+    project_id: int,
+    format: TaskFileFormat = TaskFileFormat.NDJSON,
+    session: AsyncSession = Depends(get_session),
+    importer: TaskImporter = Depends(get_task_importer),
+) -> ModelResponse:
+    """Bulk load the CSV or NDJSON file sent as the request body.
+
+    Rows are validated and written in batches with ``COPY``; the response
+    reports how many tasks were imported and which rows were rejected. The
+    body is checked to be UTF-8 while it is received, before any batch is
+    committed.
+    """
+
+    def log_progress(processed: int, report: TaskImportReport) -> None:
+        logger.info(
+            "Importing into project %s: %d rows read, %d imported, %d rejected",
+            project_id,
+            processed,
+            report.imported,
+            report.failed,
+        )
+
+    with tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_SIZE) as spool:
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        try:
+            async for chunk in request.stream():
+                decoder.decode(chunk)
+                await run_in_threadpool(spool.write, chunk)
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=ErrorResponse(
+                    code="INVALID_ENCODING", message="File must be UTF-8"
+                ).model_dump(),
+            ) from exc
+        spool.seek(0)
+        file = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+        try:
+            report = await importer.run(
+                session, project_id, read_rows(file, format), on_progress=log_progress
+            )
+        except ProjectNotFoundError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=ErrorResponse(
+                    code="PROJECT_NOT_FOUND", message="Project not found"
+                ).model_dump(),
+            ) from exc
+    return ModelResponse(report)
 
 
 @router.get(
     "/projects/{project_id}/tasks",
     response_model=TaskListResponse,
+    responses={304: {"description": "Not modified"}},
 )
 async def list_tasks(
+    request: Request,
     project_id: int,
     list_id: int | None = None,
     status: Status | None = None,
@@ -91,47 +248,156 @@ async def list_tasks(
     complexity: Complexity | None = None,
     priority: Priority | None = None,
     search: str | None = None,
+    search_mode: SearchMode = SearchMode.FULLTEXT,
     timeliness: str | None = None,
     order_by: str | None = None,
     order: str = "asc",
     offset: int = 0,
     limit: int = Query(100, ge=1),
-    session: AsyncSession = Depends(get_session),
+    cursor: str | None = None,
+    session: AsyncSession = Depends(get_read_session),
+    service: TaskService = Depends(get_task_service),
+) -> Response:
+    # Timeliness and day counts depend on the current time, so the ETag also
+    # changes every ``ETAG_TIME_BUCKET`` seconds.
+    count, updated_at = await service.fingerprint(session, project_id)
+    etag = weak_etag(
+        "tasks",
+        project_id,
+        count,
+        updated_at,
+        request.url.query,
+        int(time.time() // settings.etag_time_bucket),
+    )
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    try:
+        tasks, total, next_cursor = await service.list(
+            session,
+            project_id=project_id,
+            list_id=list_id,
+            status=status,
+            tag=tag,
+            assignee_id=assignee_id,
+            sector_id=sector_id,
+            complexity=complexity,
+            priority=priority,
+            search=search,
+            search_mode=search_mode.value,
+            timeliness=timeliness,
+            order_by=order_by,
+            order=order,
+            offset=offset,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as exc:
+        raise _invalid_cursor(exc) from exc
+    return ModelResponse(
+        TaskListResponse.model_construct(
+            tasks=tasks,
+            pagination=Pagination.model_construct(
+                total=total, offset=offset, limit=limit
+            ),
+            next_cursor=next_cursor,
+        ),
+        headers={"ETag": etag},
+    )
+
+
+EXPORT_MEDIA_TYPES = {
+    TaskFileFormat.NDJSON: "application/x-ndjson",
+    TaskFileFormat.CSV: "text/csv",
+}
+
+
+@router.get(
+    "/projects/{project_id}/tasks/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()}}
+    },
+)
+async def export_tasks(
+    project_id: int,
+    format: TaskFileFormat = TaskFileFormat.NDJSON,
+    list_id: int | None = None,
+    status: Status | None = None,
+    tag: str | None = None,
+    assignee_id: int | None = None,
+    sector_id: int | None = None,
+    complexity: Complexity | None = None,
+    priority: Priority | None = None,
+    search: str | None = None,
+    search_mode: SearchMode = SearchMode.FULLTEXT,
+    timeliness: str | None = None,
+    order_by: str | None = None,
+    order: str = "asc",
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        get_read_session_factory
+    ),
+    service: TaskService = Depends(get_task_service),
+) -> StreamingResponse:
+    """Stream every matching task of a project as NDJSON or CSV.
+
+    Accepts the filters and ordering of ``list_tasks``, without paging.
+    """
+
+    async def body() -> AsyncIterator[bytes]:
+        async with session_factory() as session:
+            async for chunk in service.export(
+                session,
+                format=format,
+                project_id=project_id,
+                list_id=list_id,
+                status=status,
+                tag=tag,
+                assignee_id=assignee_id,
+                sector_id=sector_id,
+                complexity=complexity,
+                priority=priority,
+                search=search,
+                search_mode=search_mode.value,
+                timeliness=timeliness,
+                order_by=order_by,
+                order=order,
+                chunk_size=settings.export_chunk_size,
+            ):
+                yield chunk
+
+    filename = f"project-{project_id}-tasks.{format.value}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/projects/{project_id}/board", response_model=BoardResponse)
+async def get_board(
+    project_id: int,
+    per_list: int = Query(20, ge=1, le=100),
+    session: AsyncSession = Depends(get_read_session),
     service: TaskService = Depends(get_task_service),
-) -> TaskListResponse:
-    tasks, total = await service.list(
-        session,
-        project_id=project_id,
-        list_id=list_id,
-        status=status,
-        tag=tag,
-        assignee_id=assignee_id,
-        sector_id=sector_id,
-        complexity=complexity,
-        priority=priority,
-        search=search,
-        timeliness=timeliness,
-        order_by=order_by,
-        order=order,
-        offset=offset,
-        limit=limit,
+) -> ModelResponse:
+    """Return every list of the project with its first ``per_list`` tasks."""
+    lists = await service.board(session, project_id, per_list=per_list)
+    return ModelResponse(
+        BoardResponse.model_construct(project_id=project_id, lists=lists)
     )
-    return {
-        "tasks": tasks,
-        "pagination": {"total": total, "offset": offset, "limit": limit},
-    }
 
 
 @router.get(
     "/tasks/{task_id}",
     response_model=TaskRead,
-    responses={404: {"model": ErrorResponse}},
+    responses={404: {"model": ErrorResponse}, 304: {"description": "Not modified"}},
 )
 async def get_task(
+    request: Request,
     task_id: int,
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     service: TaskService = Depends(get_task_service),
-) -> TaskRead:
+) -> Response:
     task = await service.get(session, task_id)
     if not task:
         raise HTTPException(
@@ -140,7 +406,17 @@ async def get_task(
                 code="TASK_NOT_FOUND", message="Task not found"
             ).model_dump(),
         )
-    return task
+    etag = weak_etag(
+        "task",
+        task.id,
+        task.updated_at.isoformat(),
+        task.timeliness,
+        task.days_elapsed,
+        task.days_remaining,
+    )
+    if if_none_match(request, etag):
+        return not_modified(etag)
+    return ModelResponse(task, headers={"ETag": etag})
 
 
 @router.patch(
@@ -153,7 +429,7 @@ async def update_task(
     task_in: TaskUpdate,
     session: AsyncSession = Depends(get_session),
     service: TaskService = Depends(get_task_service),
-) -> TaskRead:
+) -> ModelResponse:
     data = task_in.model_dump(exclude_unset=True)
     task = await service.update(session, task_id, data)
     if not task:
@@ -163,7 +439,7 @@ async def update_task(
                 code="TASK_NOT_FOUND", message="Task not found"
             ).model_dump(),
         )
-    return task
+    return ModelResponse(task)
 
 
 @router.post(
@@ -176,7 +452,7 @@ async def move_task(
     body: MoveTaskBody,
     session: AsyncSession = Depends(get_session),
     service: TaskService = Depends(get_task_service),
-) -> TaskRead:
+) -> ModelResponse:
     task = await service.move(session, task_id, list_id=body.list_id)
     if not task:
         raise HTTPException(
@@ -185,7 +461,7 @@ async def move_task(
                 code="TASK_NOT_FOUND", message="Task not found"
             ).model_dump(),
         )
-    return task
+    return ModelResponse(task)
 
 
 @router.post(
@@ -197,7 +473,7 @@ async def archive_task(
     task_id: int,
     session: AsyncSession = Depends(get_session),
     service: TaskService = Depends(get_task_service),
-) -> TaskRead:
+) -> ModelResponse:
     task = await service.archive(session, task_id)
     if not task:
         raise HTTPException(
@@ -206,7 +482,52 @@ async def archive_task(
                 code="TASK_NOT_FOUND", message="Task not found"
             ).model_dump(),
         )
-    return task
+    return ModelResponse(task)
+
+
+def _batch_update_response(task_ids: list[int], tasks: list[TaskRead]) -> ModelResponse:
+    found = {task.id for task in tasks}
+    not_found = [task_id for task_id in dict.fromkeys(task_ids) if task_id not in found]
+    return ModelResponse(
+        TaskBatchUpdateResponse.model_construct(tasks=tasks, not_found=not_found)
+    )
+
+
+@router.patch("/tasks:batch", response_model=TaskBatchUpdateResponse)
+async def update_tasks_batch(
+    body: TaskBatchUpdateBody,
+    session: AsyncSession = Depends(get_session),
+    service: TaskService = Depends(get_task_service),
+) -> ModelResponse:
+    if body.items is not None:
+        patches = {
+            item.id: item.patch.model_dump(exclude_unset=True) for item in body.items
+        }
+        tasks = await service.update_each(session, patches)
+        return _batch_update_response(list(patches), tasks)
+    data = body.patch.model_dump(exclude_unset=True)
+    tasks = await service.update_many(session, body.ids, data)
+    return _batch_update_response(body.ids, tasks)
+
+
+@router.post("/tasks:move", response_model=TaskBatchUpdateResponse)
+async def move_tasks_batch(
+    body: MoveTasksBody,
+    session: AsyncSession = Depends(get_session),
+    service: TaskService = Depends(get_task_service),
+) -> ModelResponse:
+    tasks = await service.move_many(session, body.ids, list_id=body.list_id)
+    return _batch_update_response(body.ids, tasks)
+
+
+@router.post("/tasks:archive", response_model=TaskBatchUpdateResponse)
+async def archive_tasks_batch(
+    body: TaskIdsBody,
+    session: AsyncSession = Depends(get_session),
+    service: TaskService = Depends(get_task_service),
+) -> ModelResponse:
+    tasks = await service.archive_many(session, body.ids)
+    return _batch_update_response(body.ids, tasks)
 
 
 __all__ = ["router"]
@@ -0,0 +1,102 @@
+"""In-process caches shared by all requests of a worker."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+from .metrics import CACHE_EVICTIONS, CACHE_HITS, CACHE_MISSES
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Returned by :meth:`TTLCache.get` when a key is absent, so that ``None`` can
+# be cached as a value (e.g. for negative lookups).
+MISSING: Any = object()
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire after a time to live.
+
+    Hits and misses are counted in Prometheus under the cache ``name``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: OrderedDict[K, tuple[V, float]] = OrderedDict()
+
+    def get(self, key: K, default: Any = MISSING) -> Any:
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > self._timer():
+                self._data.move_to_end(key)
+                CACHE_HITS.labels(cache=self.name).inc()
+                return value
+            del self._data[key]
+        CACHE_MISSES.labels(cache=self.name).inc()
+        return default
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        expires_at = self._timer() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            CACHE_EVICTIONS.labels(cache=self.name).inc()
+
+    def invalidate(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight(Generic[K, V]):
+    """Collapse concurrent calls for the same key into a single call.
+
+    Callers arriving while a call for ``key`` is in flight await its result
+    instead of starting their own. A waiter being cancelled does not cancel
+    the shared call.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[K, asyncio.Future[V]] = {}
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(future)
+
+    def forget(self, key: K) -> None:
+        """Make later callers start a new call instead of joining the current one.
+
+        The call already in flight still completes for its own waiters.
+        """
+        self._calls.pop(key, None)
+
+    def _forget(self, key: K, future: asyncio.Future[V]) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+
+__all__ = ["MISSING", "SingleFlight", "TTLCache"]
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import time
 from collections.abc import AsyncGenerator
 
+from fastapi import Request
+from servicekit.db_pool import DB_POOL, TimedQueuePool
 from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
 from .settings import settings
@@ -17,13 +25,77 @@ class Base(DeclarativeBase):
     metadata = metadata
 
 
-engine = create_async_engine(str(settings.tasks_database_url))
+def create_engine(url: str, name: str = "primary") -> AsyncEngine:
+    """Create an engine with the pool settings of this deployment.
+
+    Set ``DB_STATEMENT_CACHE_SIZE=0`` behind PgBouncer in transaction mode,
+    where prepared statements cannot be reused across transactions.
+    """
+    return create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_logging_name=name,
+        connect_args={
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        },
+    )
+
+
+engine = create_engine(str(settings.tasks_database_url))
+DB_POOL.add("primary", engine.pool)
 async_session_factory = async_sessionmaker(
     engine, expire_on_commit=False, class_=AsyncSession
 )
 
 
+read_engine: AsyncEngine | None = None
+read_session_factory: async_sessionmaker[AsyncSession] | None = None
+if settings.tasks_read_database_url is not None:
+    read_engine = create_engine(str(settings.tasks_read_database_url), "replica")
+    DB_POOL.add("replica", read_engine.pool)
+    read_session_factory = async_sessionmaker(
+        read_engine, expire_on_commit=False, class_=AsyncSession
+    )
+
+# Set on responses to writes; while it is valid, reads of that client go to
+# the primary so it sees its own changes despite replication lag.
+READ_YOUR_WRITES_COOKIE = "tasks_primary_until"
+
+
+def wrote_recently(request: Request) -> bool:
+    value = request.cookies.get(READ_YOUR_WRITES_COOKIE)
+    try:
+        return value is not None and float(value) > time.time()
+    except ValueError:
+        return False
+
+
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     """Provide a transactional scope around a series of operations."""
     async with async_session_factory() as session:
         yield session
+
+
+def get_read_session_factory(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Choose the session factory for read-only routes.
+
+    It is the read replica's when ``TASKS_READ_DATABASE_URL`` is set, unless
+    the client wrote within the last ``READ_YOUR_WRITES_WINDOW`` seconds.
+    Streaming routes open their session from it inside the response body, as
+    dependency sessions are closed before the body is sent.
+    """
+    if read_session_factory is None or wrote_recently(request):
+        return async_session_factory
+    return read_session_factory
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Provide a session for read-only routes, see :func:`get_read_session_factory`."""
+    async with get_read_session_factory(request)() as session:
+        yield session
@@ -0,0 +1,80 @@
+"""Application wide HTTP client for calls to the other services.
+
+A single :class:`httpx.AsyncClient` is shared by the whole process so calls to
+user-service and auth-service reuse pooled keep-alive connections instead of
+paying a new TCP handshake each time. The client is opened and closed by the
+application lifespan; scripts and tests that run without it get one lazily.
+"""
+
+from __future__ import annotations
+
+import httpx
+
+from .settings import settings
+
+_client: httpx.AsyncClient | None = None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build a client configured from :mod:`app.core.settings`.
+
+    ``HTTP2`` requires the optional ``h2`` package (``httpx[http2]``).
+    """
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            settings.http_timeout, connect=settings.http_connect_timeout
+        ),
+        http2=settings.http2,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def service_url(base_url: str, path: str) -> str:
+    """Join a service base URL from the settings with an absolute ``path``."""
+    return f"{str(base_url).rstrip('/')}{path}"
+
+
+def pool_stats() -> dict[str, int]:
+    """Return connection and request counts of the shared client's pool.
+
+    httpx does not expose pool statistics, so this reads the httpcore pool
+    defensively and reports zeros when its internals are unavailable.
+    """
+    stats = {"active": 0, "idle": 0, "queued": 0}
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    if pool is None:
+        return stats
+    for connection in getattr(pool, "connections", []):
+        stats["idle" if connection.is_idle() else "active"] += 1
+    stats["queued"] = sum(
+        1 for request in getattr(pool, "_requests", []) if request.is_queued()
+    )
+    return stats
+
+
+__all__ = [
+    "close_http_client",
+    "create_http_client",
+    "get_http_client",
+    "pool_stats",
+    "service_url",
+]
@@ -0,0 +1,123 @@
+"""In-memory copy of the auth service JSON Web Key Set."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+from fastapi import HTTPException, status
+
+from .cache import SingleFlight
+from .http import get_http_client
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSManager:
+    """Serve signing keys from a key set that is refreshed as a whole.
+
+    Once ``refresh_ahead`` seconds remain before the key set expires, requests
+    keep using it while a single refresh runs in the background. Concurrent
+    fetches are collapsed into one, a ``kid`` that is not in the key set
+    triggers at most one refetch per ``min_refetch_interval``, and if the auth
+    service cannot be reached the last good key set is served for up to
+    ``max_stale`` seconds past its expiry.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        ttl: float = 600.0,
+        refresh_ahead: float = 60.0,
+        min_refetch_interval: float = 30.0,
+        max_stale: float = 3600.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.url = url
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.min_refetch_interval = min_refetch_interval
+        self.max_stale = max_stale
+        self._timer = timer
+        self._keys: dict[str, dict[str, Any]] = {}
+        self._expires_at: float | None = None
+        self._last_attempt: float | None = None
+        self._fetches: SingleFlight[str, None] = SingleFlight()
+        self._background: asyncio.Task[None] | None = None
+
+    async def get(self, kid: str) -> dict[str, Any]:
+        now = self._timer()
+        if self._expires_at is None or now >= self._expires_at:
+            if self._may_fetch(now):
+                await self.refresh()
+        elif now >= self._expires_at - self.refresh_ahead:
+            self._refresh_in_background()
+        if (
+            self._expires_at is None
+            or self._timer() >= self._expires_at + self.max_stale
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Could not fetch JWKS",
+            )
+
+        jwk = self._keys.get(kid)
+        if jwk is None and self._may_fetch(self._timer()):
+            await self.refresh()
+            jwk = self._keys.get(kid)
+        if jwk is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+            )
+        return jwk
+
+    async def refresh(self) -> None:
+        """Fetch the key set, sharing any fetch that is already running."""
+        await self._fetches.do(self.url, self._fetch)
+
+    def clear(self) -> None:
+        self._keys.clear()
+        self._expires_at = None
+        self._last_attempt = None
+
+    def _may_fetch(self, now: float) -> bool:
+        return (
+            self._last_attempt is None
+            or now - self._last_attempt >= self.min_refetch_interval
+        )
+
+    def _refresh_in_background(self) -> None:
+        if self._background is None or self._background.done():
+            self._background = asyncio.create_task(self._refresh_quietly())
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            await self.refresh()
+        except HTTPException:
+            pass
+
+    async def _fetch(self) -> None:
+        self._last_attempt = self._timer()
+        try:
+            resp = await get_http_client().get(self.url)
+            resp.raise_for_status()
+            keys = {jwk["kid"]: jwk for jwk in resp.json().get("keys", [])}
+        except (httpx.HTTPError, ValueError, KeyError) as exc:
+            now = self._timer()
+            if self._expires_at is not None and now < self._expires_at + self.max_stale:
+                logger.warning("JWKS refresh failed, serving cached keys: %s", exc)
+                return
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Could not fetch JWKS",
+            ) from exc
+        self._keys = keys
+        self._expires_at = self._timer() + self.ttl
+
+
+__all__ = ["JWKSManager"]
@@ -6,10 +6,11 @@ as ``request_id``, ``user_id`` and ``project_id`` when those values are
 available.
 """
 
-import json
 import logging
 from contextvars import ContextVar
-from typing import Any, Dict
+from typing import Any, Dict, Mapping
+
+from servicekit.logging import SamplingFilter, dumps, parse_sampling, setup_logging
 
 # Context variables used to inject request related information into log
 # records.  Only non-sensitive identifiers are stored here to avoid leaking PII.
@@ -18,6 +19,27 @@ user_id_ctx_var: ContextVar[str | None] = ContextVar("user_id", default=None)
 project_id_ctx_var: ContextVar[str | None] = ContextVar("project_id", default=None)
 
 
+_CONTEXT_VARS = {
+    "request_id": request_id_ctx_var,
+    "user_id": user_id_ctx_var,
+    "project_id": project_id_ctx_var,
+}
+
+
+class ContextFilter(logging.Filter):
+    """Copy the request context onto the record.
+
+    Records are formatted on the listener thread, where the context variables
+    of the request that logged them are not visible.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for name, var in _CONTEXT_VARS.items():
+            if not hasattr(record, name):
+                setattr(record, name, var.get())
+        return True
+
+
 class JsonFormatter(logging.Formatter):
     """Format log records as JSON including optional context data."""
 
@@ -31,32 +53,35 @@ class JsonFormatter(logging.Formatter):
         # Enrich the log with request specific identifiers if they are set in
         # the current context.  These identifiers are non-sensitive and allow
         # tracing of events without exposing PII.
-        request_id = request_id_ctx_var.get()
-        if request_id:
-            log_record["request_id"] = request_id
-        user_id = user_id_ctx_var.get()
-        if user_id:
-            log_record["user_id"] = user_id
-        project_id = project_id_ctx_var.get()
-        if project_id:
-            log_record["project_id"] = project_id
+        for name, var in _CONTEXT_VARS.items():
+            value = getattr(record, name, None) or var.get()
+            if value:
+                log_record[name] = value
 
         if record.exc_info:
             log_record["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(log_record)
+        return dumps(log_record)
+
 
+def configure_logging(
+    level: str = "INFO", sampling: Mapping[str, float] | None = None
+) -> None:
+    """Configure application logging with JSON formatter.
 
-def configure_logging() -> None:
-    """Configure application logging with JSON formatter."""
-    handler = logging.StreamHandler()
-    handler.setFormatter(JsonFormatter())
-    root = logging.getLogger()
-    root.setLevel(logging.INFO)
-    root.handlers = [handler]
+    Records are put on a queue and written to stderr by a background thread,
+    so a slow log consumer never blocks the event loop.
+    """
+    setup_logging(
+        sampling, level=level, formatter=JsonFormatter(), context_filter=ContextFilter()
+    )
 
 
 __all__ = [
+    "ContextFilter",
+    "JsonFormatter",
+    "SamplingFilter",
     "configure_logging",
+    "parse_sampling",
     "request_id_ctx_var",
     "user_id_ctx_var",
     "project_id_ctx_var",
@@ -2,7 +2,14 @@
 
 from __future__ import annotations
 
-from prometheus_client import Counter, Gauge, Histogram
+from collections.abc import Iterator, Mapping
+
+from prometheus_client import REGISTRY, Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from servicekit.db_pool import DB_POOL, DB_POOL_WAIT
+
+from .http import pool_stats
 
 REQUEST_COUNTER = Counter(
     "http_requests_total",
@@ -16,13 +23,79 @@ REQUEST_LATENCY = Histogram(
     ["method", "path"],
 )
 
-TASKS_STATUS_GAUGE = Gauge(
-    "tasks_status_total",
-    "Number of tasks by status",
-    ["status"],
+
+class TaskStatusCollector(Collector):
+    """Report the latest snapshot of task counts by status.
+
+    The snapshot is replaced by a periodic background refresh, so a scrape
+    only reads memory and never queries the database.
+    """
+
+    def __init__(self) -> None:
+        self._counts: dict[str, int] = {}
+
+    def set_counts(self, counts: Mapping[str, int]) -> None:
+        self._counts = dict(counts)
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        gauge = GaugeMetricFamily(
+            "tasks_status_total", "Number of tasks by status", labels=["status"]
+        )
+        for status, count in self._counts.items():
+            gauge.add_metric([status], count)
+        yield gauge
+
+
+CACHE_HITS = Counter("cache_hits_total", "In-process cache hits", ["cache"])
+
+CACHE_MISSES = Counter("cache_misses_total", "In-process cache misses", ["cache"])
+
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entries evicted from an in-process cache because it was full",
+    ["cache"],
+)
+
+ACTIVITY_LOG_DROPPED = Counter(
+    "activity_log_dropped_total",
+    "Activity log entries discarded because the buffer was full or a write failed",
 )
 
+
+class HTTPClientPoolCollector(Collector):
+    """Report the state of the shared HTTP client pool at scrape time."""
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        stats = pool_stats()
+        connections = GaugeMetricFamily(
+            "http_client_pool_connections",
+            "Connections in the outgoing HTTP client pool",
+            labels=["state"],
+        )
+        for state in ("active", "idle"):
+            connections.add_metric([state], stats[state])
+        yield connections
+        yield GaugeMetricFamily(
+            "http_client_pool_queued_requests",
+            "Outgoing HTTP requests waiting for a pooled connection",
+            value=stats["queued"],
+        )
+
+
+HTTP_CLIENT_POOL = HTTPClientPoolCollector()
+REGISTRY.register(HTTP_CLIENT_POOL)
+
+TASKS_STATUS_GAUGE = TaskStatusCollector()
+REGISTRY.register(TASKS_STATUS_GAUGE)
+
 __all__ = [
+    "ACTIVITY_LOG_DROPPED",
+    "CACHE_EVICTIONS",
+    "CACHE_HITS",
+    "CACHE_MISSES",
+    "DB_POOL",
+    "DB_POOL_WAIT",
+    "HTTP_CLIENT_POOL",
     "REQUEST_COUNTER",
     "REQUEST_LATENCY",
     "TASKS_STATUS_GAUGE",
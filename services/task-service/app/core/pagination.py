@@ -0,0 +1,56 @@
+"""Opaque cursors for keyset pagination.
+
+A cursor records the sort key and ``id`` of the last row of a page together
+with the ordering it was produced for, so the next page can be fetched with
+a ``WHERE (key, id) > (:key, :id)`` predicate instead of an ``OFFSET``.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded or does not match the query."""
+
+
+@dataclass(frozen=True)
+class Cursor:
+    order_by: str | None
+    order: str
+    key: Any
+    id: int
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    key = cursor.key
+    if isinstance(key, datetime):
+        key = {"dt": key.isoformat()}
+    payload = {"o": cursor.order_by, "d": cursor.order, "k": key, "i": cursor.id}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(value: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+        payload = json.loads(raw)
+        key = payload["k"]
+        if isinstance(key, dict) and set(key) == {"dt"}:
+            key = datetime.fromisoformat(key["dt"])
+        return Cursor(
+            order_by=payload["o"],
+            order=payload["d"],
+            key=key,
+            id=int(payload["i"]),
+        )
+    except (binascii.Error, ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursorError("Invalid cursor") from exc
+
+
+__all__ = ["Cursor", "InvalidCursorError", "decode_cursor", "encode_cursor"]
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from collections import Counter
 from typing import Any
 
 import httpx
 from fastapi import Depends, HTTPException, status
 
+from .cache import MISSING, SingleFlight, TTLCache
+from .http import get_http_client, service_url
 from .logging import project_id_ctx_var, user_id_ctx_var
 from .security import get_current_user
 from .settings import settings
@@ -17,10 +20,60 @@ ROLE_PERMISSIONS: dict[str, set[str]] = {
 }
 
 
+# Roles by ``(project_id, user_id)``. ``None`` records a non-member. Entries
+# live for ``ROLE_CACHE_TTL`` seconds; membership changes made through this
+# service invalidate them right away.
+ROLE_CACHE: TTLCache[tuple[int, str], str | None] = TTLCache(
+    "project_roles", maxsize=settings.role_cache_max_size, ttl=settings.role_cache_ttl
+)
+_role_lookups: SingleFlight[tuple[int, str], str | None] = SingleFlight()
+# Bumped when a membership is invalidated while a lookup for it runs, so that
+# the lookup does not cache the role it read before the change. Entries only
+# exist while lookups of the key are in flight.
+_role_generations: dict[tuple[int, str], int] = {}
+_role_fetches: Counter[tuple[int, str]] = Counter()
+
+
+async def get_project_role(project_id: int, user_id: str | int) -> str | None:
+    """Return the cached role of ``user_id`` in ``project_id``.
+
+    Concurrent misses for the same membership share one user service call.
+    """
+    key = (project_id, str(user_id))
+    role = ROLE_CACHE.get(key)
+    if role is not MISSING:
+        return role
+
+    async def fetch() -> str | None:
+        generation = _role_generations.get(key, 0)
+        _role_fetches[key] += 1
+        try:
+            role = await _fetch_project_role(project_id, str(user_id))
+            if _role_generations.get(key, 0) == generation:
+                ROLE_CACHE.set(key, role)
+            return role
+        finally:
+            _role_fetches[key] -= 1
+            if not _role_fetches[key]:
+                del _role_fetches[key]
+                _role_generations.pop(key, None)
+
+    return await _role_lookups.do(key, fetch)
+
+
+def invalidate_project_role(project_id: int, user_id: str | int) -> None:
+    key = (project_id, str(user_id))
+    ROLE_CACHE.invalidate(key)
+    if key in _role_fetches:
+        _role_generations[key] = _role_generations.get(key, 0) + 1
+    _role_lookups.forget(key)
+
+
 async def _fetch_project_role(
     project_id: int,
     user_id: str,
     base_url: str | None = None,
+    client: httpx.AsyncClient | None = None,
 ) -> str | None:
     """Return the role of ``user_id`` in ``project_id``.
 
@@ -28,13 +81,15 @@ async def _fetch_project_role(
     member of the project the service is expected to return a 404 status code.
     """
     base_url = base_url or str(settings.user_service_base_url)
-    async with httpx.AsyncClient(base_url=base_url) as client:
-        resp = await client.get(f"/projects/{project_id}/members/{user_id}")
-        if resp.status_code == status.HTTP_404_NOT_FOUND:
-            return None
-        resp.raise_for_status()
-        data = resp.json()
-        return data.get("role")
+    client = client or get_http_client()
+    resp = await client.get(
+        service_url(base_url, f"/projects/{project_id}/members/{user_id}")
+    )
+    if resp.status_code == status.HTTP_404_NOT_FOUND:
+        return None
+    resp.raise_for_status()
+    data = resp.json()
+    return data.get("role")
 
 
 def require_project_permission(action: str):
@@ -53,7 +108,7 @@ def require_project_permission(action: str):
         project_id: int,
         user: dict[str, Any] = Depends(get_current_user),
     ) -> dict[str, Any]:
-        role = await _fetch_project_role(project_id, user["user_id"])
+        role = await get_project_role(project_id, user["user_id"])
         if role is None or role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -71,6 +126,9 @@ def require_project_permission(action: str):
 
 
 __all__ = [
+    "ROLE_CACHE",
     "ROLE_PERMISSIONS",
+    "get_project_role",
+    "invalidate_project_role",
     "require_project_permission",
 ]
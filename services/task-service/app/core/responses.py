@@ -0,0 +1,25 @@
+"""Response classes shared by the API routers."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+class ModelResponse(JSONResponse):
+    """JSON response rendered directly by a pydantic model's serializer.
+
+    Returning it from an endpoint skips FastAPI's ``response_model`` pass, so
+    it is meant for models built from trusted data with ``model_construct``.
+    The route's ``response_model`` still documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json().encode()
+        return super().render(content)
+
+
+__all__ = ["ModelResponse"]
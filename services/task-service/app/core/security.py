@@ -1,48 +1,65 @@
 from __future__ import annotations
 
+import hashlib
 import time
 from typing import Any
 
-import httpx
 import jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from .cache import MISSING, TTLCache
+from .jwks import JWKSManager
 from .logging import user_id_ctx_var
 from .settings import settings
 
-JWKS_CACHE_TTL_SECONDS = 600
-_jwks_cache: dict[str, tuple[dict[str, Any], float]] = {}
+jwks = JWKSManager(
+    str(settings.auth_jwks_url),
+    ttl=settings.jwks_cache_ttl,
+    refresh_ahead=settings.jwks_refresh_ahead,
+    min_refetch_interval=settings.jwks_min_refetch_interval,
+    max_stale=settings.jwks_max_stale,
+)
+
+# Key objects parsed from JWKs, by ``kid``, and the claims of tokens that
+# passed verification, by SHA-256 of the token. Claims are kept no longer
+# than ``TOKEN_CACHE_TTL`` nor past the token's ``exp``.
+_parsed_keys: TTLCache[str, tuple[dict[str, Any], Any]] = TTLCache(
+    "jwt_keys", maxsize=64, ttl=settings.jwks_cache_ttl
+)
+_verified_tokens: TTLCache[bytes, dict[str, Any]] = TTLCache(
+    "verified_tokens",
+    maxsize=settings.token_cache_max_size,
+    ttl=settings.token_cache_ttl,
+)
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
 async def _get_jwk(kid: str) -> dict[str, Any]:
-    cached = _jwks_cache.get(kid)
-    now = time.time()
-    if cached and cached[1] > now:
-        return cached[0]
-
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.get(str(settings.auth_jwks_url))
-            resp.raise_for_status()
-        except httpx.HTTPError as exc:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Could not fetch JWKS",
-            ) from exc
-    jwks = resp.json()
-    for jwk in jwks.get("keys", []):
-        if jwk.get("kid") == kid:
-            _jwks_cache[kid] = (jwk, now + JWKS_CACHE_TTL_SECONDS)
-            return jwk
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-    )
+    return await jwks.get(kid)
+
+
+def _get_key(kid: str, jwk: dict[str, Any]) -> Any:
+    cached = _parsed_keys.get(kid)
+    if cached is not MISSING and cached[0] == jwk:
+        return cached[1]
+    key = jwt.PyJWK.from_dict(jwk).key
+    _parsed_keys.set(kid, (jwk, key))
+    return key
+
+
+def clear_token_caches() -> None:
+    _parsed_keys.clear()
+    _verified_tokens.clear()
 
 
 async def validate_token(token: str) -> dict[str, Any]:
+    digest = hashlib.sha256(token.encode()).digest()
+    cached = _verified_tokens.get(digest)
+    if cached is not MISSING:
+        return dict(cached)
+
     try:
         header = jwt.get_unverified_header(token)
     except jwt.PyJWTError as exc:
@@ -56,7 +73,7 @@ async def validate_token(token: str) -> dict[str, Any]:
         )
     jwk = await _get_jwk(kid)
     try:
-        key = jwt.PyJWK.from_dict(jwk).key
+        key = _get_key(kid, jwk)
         payload = jwt.decode(
             token, key, algorithms=[jwk["alg"]], options={"verify_aud": False}
         )
@@ -64,6 +81,13 @@ async def validate_token(token: str) -> dict[str, Any]:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
         ) from exc
+
+    ttl = settings.token_cache_ttl
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        _verified_tokens.set(digest, payload, ttl=ttl)
     return payload
 
 
@@ -89,4 +113,4 @@ async def get_current_user(
     return {"user_id": user_id, "sector_id": sector_id, "claims": payload}
 
 
-__all__ = ["validate_token", "get_current_user"]
+__all__ = ["JWKSManager", "clear_token_caches", "validate_token", "get_current_user"]
@@ -3,12 +3,27 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import (
+    DDL,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..core.database import Base
 
+# Text search configuration of ``tasks.search_vector``. ``simple`` does no
+# stemming, so it works for any language the tasks are written in.
+SEARCH_CONFIG = "simple"
+
 
 class Project(Base):
     __tablename__ = "projects"
@@ -25,11 +40,47 @@ class Project(Base):
     lists: Mapped[list["List"]] = relationship("List", back_populates="project")
 
 
+class ProjectTaskCounter(Base):
+    """Last task number handed out in a project, used to build task codes."""
+
+    __tablename__ = "project_task_counters"
+
+    project_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    last_value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class ProjectTaskStats(Base):
+    """Summary of a project's tasks.
+
+    Task writes adjust the counters in their own transaction; the periodic
+    reconciler recomputes the whole row to catch tasks that became overdue or
+    left the current week since they were last written.
+    """
+
+    __tablename__ = "project_task_stats"
+
+    project_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True
+    )
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    by_status: Mapped[dict[str, int]] = mapped_column(JSONB, default=dict)
+    by_priority: Mapped[dict[str, int]] = mapped_column(JSONB, default=dict)
+    by_complexity: Mapped[dict[str, int]] = mapped_column(JSONB, default=dict)
+    overdue: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_this_week: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
 class Task(Base):
     __tablename__ = "tasks"
     __table_args__ = (
         Index("ix_tasks_project_status", "project_id", "status"),
         Index("ix_tasks_tags", "tags", postgresql_using="gin"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        # The trigram index on ``title`` needs the ``pg_trgm`` extension and is
+        # created by the ``0002_task_search`` migration.
     )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -51,6 +102,16 @@ class Task(Base):
     assignee_ids: Mapped[list[int]] = mapped_column(JSONB, default=list)
     sector_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     tags: Mapped[list[str]] = mapped_column(JSONB, default=list)
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')"
+            f" || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')),"
+            " 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -86,6 +147,14 @@ class List(Base):
 
 class Comment(Base):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index(
+            "ix_comments_mentions",
+            "mentions",
+            postgresql_using="gin",
+            postgresql_ops={"mentions": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_id: Mapped[int] = mapped_column(
@@ -93,6 +162,8 @@ class Comment(Base):
     )
     author_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Usernames mentioned in ``content``, extracted when it is written.
+    mentions: Mapped[list[str]] = mapped_column(JSONB, nullable=False, default=list)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -102,7 +173,20 @@ class Comment(Base):
 
 
 class ActivityLog(Base):
+    """Task activity, range partitioned by month on ``created_at``.
+
+    Monthly partitions are created ahead of time and dropped once expired by
+    :func:`app.services.activity.maintain_activity_log_partitions`; rows
+    outside every monthly partition land in ``activity_logs_default``.
+    """
+
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        Index(
+            "ix_activity_logs_task_id_created_at", "task_id", text("created_at DESC")
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     task_id: Mapped[Optional[int]] = mapped_column(
@@ -111,6 +195,20 @@ class ActivityLog(Base):
     action: Mapped[str] = mapped_column(String, nullable=False)
     performed_by: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     details: Mapped[Optional[dict[str, Any]]] = mapped_column(JSONB, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Part of the primary key because Postgres requires the partition key in
+    # every unique constraint of a partitioned table.
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, primary_key=True, default=datetime.utcnow
+    )
 
     task: Mapped[Optional[Task]] = relationship("Task", back_populates="activity_logs")
+
+
+event.listen(
+    ActivityLog.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE %(schema)s.activity_logs_default "
+        "PARTITION OF %(fullname)s DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
@@ -25,6 +25,16 @@ class Priority(str, Enum):
     HIGH = "high"
 
 
+class SearchMode(str, Enum):
+    FULLTEXT = "fulltext"
+    FUZZY = "fuzzy"
+
+
+class TaskFileFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class Role(str, Enum):
     OWNER = "owner"
     MEMBER = "member"
@@ -48,6 +58,19 @@ class ProjectRead(ProjectBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ProjectStatsRead(BaseModel):
+    project_id: int
+    total: int
+    by_status: dict[str, int]
+    by_priority: dict[str, int]
+    by_complexity: dict[str, int]
+    overdue: int
+    completed_this_week: int
+    refreshed_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class ProjectMemberUpdate(BaseModel):
     role: Role
 
@@ -123,7 +146,7 @@ class TaskRead(TaskBase):
 
 
 class Pagination(BaseModel):
-    total: int
+    total: int | None = None
     offset: int
     limit: int
 
@@ -131,6 +154,17 @@ class Pagination(BaseModel):
 class TaskListResponse(BaseModel):
     tasks: list[TaskRead]
     pagination: Pagination
+    next_cursor: str | None = None
+
+
+class BoardList(ListRead):
+    tasks: list[TaskRead]
+    total: int
+
+
+class BoardResponse(BaseModel):
+    project_id: int
+    lists: list[BoardList]
 
 
 class ErrorResponse(BaseModel):
@@ -138,6 +172,29 @@ class ErrorResponse(BaseModel):
     message: str
 
 
+class TaskBatchError(ErrorResponse):
+    index: int
+
+
+class TaskBatchResponse(BaseModel):
+    tasks: list[TaskRead]
+    errors: list[TaskBatchError]
+
+
+class TaskImportReport(BaseModel):
+    # Rows read from the file; an import that stopped early left the rest.
+    processed: int
+    imported: int
+    failed: int
+    # Capped at ``IMPORT_MAX_ERRORS``; ``failed`` counts every rejected row.
+    errors: list[TaskBatchError]
+
+
+class TaskBatchUpdateResponse(BaseModel):
+    tasks: list[TaskRead]
+    not_found: list[int]
+
+
 class CommentBase(BaseModel):
     task_id: int
     content: str
@@ -165,7 +222,7 @@ class ActivityLogBase(BaseModel):
 
 
 class ActivityLogCreate(ActivityLogBase):
-    pass
+    created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class ActivityLogRead(ActivityLogBase):
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Bulk import tasks into a project from a CSV or NDJSON file.
+
+Usage: ``python -m app.import_tasks PROJECT_ID FILE [--format csv|ndjson]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from .core.database import async_session_factory
+from .core.http import close_http_client
+from .domain.schemas import TaskFileFormat, TaskImportReport
+from .services import TaskImporter
+from .services.activity import activity_log
+from .services.imports import ProjectNotFoundError, read_rows
+
+
+def print_progress(processed: int, report: TaskImportReport) -> None:
+    print(
+        f"{processed} rows read, {report.imported} imported, "
+        f"{report.failed} rejected",
+        file=sys.stderr,
+    )
+
+
+async def import_file(
+    project_id: int,
+    path: Path,
+    format: TaskFileFormat,
+    batch_size: int | None = None,
+) -> TaskImportReport:
+    importer = TaskImporter(batch_size=batch_size)
+    try:
+        async with async_session_factory() as session:
+            with path.open(encoding="utf-8", newline="") as file:
+                return await importer.run(
+                    session,
+                    project_id,
+                    read_rows(file, format),
+                    on_progress=print_progress,
+                )
+    finally:
+        await activity_log.flush()
+        await close_http_client()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("project_id", type=int)
+    parser.add_argument("file", type=Path)
+    parser.add_argument(
+        "--format",
+        choices=[fmt.value for fmt in TaskFileFormat],
+        help="file format, by default taken from the file extension",
+    )
+    parser.add_argument("--batch-size", type=int)
+    args = parser.parse_args(argv)
+    format = TaskFileFormat(
+        args.format or ("csv" if args.file.suffix.lower() == ".csv" else "ndjson")
+    )
+
+    try:
+        report = asyncio.run(
+            import_file(args.project_id, args.file, format, args.batch_size)
+        )
+    except ProjectNotFoundError:
+        parser.error(f"project {args.project_id} does not exist")
+    for error in report.errors:
+        print(f"row {error.index}: {error.code}: {error.message}", file=sys.stderr)
+    print(
+        f"Read {report.processed} rows, imported {report.imported} tasks, "
+        f"rejected {report.failed} rows"
+    )
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
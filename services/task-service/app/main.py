@@ -1,18 +1,69 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .api.health import router as health_router
 from .api.router import router
-from .core.logging import configure_logging
-from .core.middleware import MetricsMiddleware, RequestIDMiddleware
+from .core.http import close_http_client, get_http_client
+from .core.logging import configure_logging, parse_sampling
+from .core.middleware import (
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+    RequestIDMiddleware,
+)
 from .core.settings import settings
+from .services.activity import activity_log, run_activity_log_maintenance
+from .services.projects import run_project_stats_reconciler
+from .services.tasks import run_task_status_refresher
+
+configure_logging(settings.log_level, parse_sampling(settings.log_sampling))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    get_http_client()
+    activity_log.start()
+    jobs = []
+    if settings.task_status_metrics_interval > 0:
+        jobs.append(
+            asyncio.create_task(
+                run_task_status_refresher(settings.task_status_metrics_interval)
+            )
+        )
+    if settings.project_stats_reconcile_interval > 0:
+        jobs.append(
+            asyncio.create_task(
+                run_project_stats_reconciler(settings.project_stats_reconcile_interval)
+            )
+        )
+    if settings.activity_log_maintenance_interval > 0:
+        jobs.append(
+            asyncio.create_task(
+                run_activity_log_maintenance(settings.activity_log_maintenance_interval)
+            )
+        )
+    try:
+        yield
+    finally:
+        for job in jobs:
+            job.cancel()
+            with suppress(asyncio.CancelledError):
+                await job
+        await activity_log.stop()
+        await close_http_client()
 
-configure_logging()
 
-app = FastAPI(title="Task Service")
+app = FastAPI(title="Task Service", lifespan=lifespan)
 
 app.add_middleware(RequestIDMiddleware)
 app.add_middleware(MetricsMiddleware)
+if settings.tasks_read_database_url is not None:
+    app.add_middleware(
+        ReadYourWritesMiddleware, window=settings.read_your_writes_window
+    )
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_allow_origins,
@@ -4,6 +4,7 @@ from .activity import ActivityLogRepository
 from .comments import CommentRepository
 from .lists import ListRepository
 from .projects import ProjectRepository
+from .stats import ProjectStatsRepository
 from .tasks import TaskRepository
 
 __all__ = [
@@ -12,4 +13,5 @@ __all__ = [
     "TaskRepository",
     "CommentRepository",
     "ActivityLogRepository",
+    "ProjectStatsRepository",
 ]
@@ -1,13 +1,39 @@
 from __future__ import annotations
 
+import re
+from collections.abc import Sequence
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Select,
+    String,
+    cast,
+    column,
+    func,
+    insert,
+    select,
+    text,
+    values,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..domain.models import ActivityLog
+from ..domain.models import ActivityLog, Task
 from ..domain.schemas import ActivityLogCreate
 
+_PARTITION_NAME = re.compile(r"^activity_logs_p(\d{4})_(\d{2})$")
+
+
+def _month(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
 
 class ActivityLogRepository:
     async def create(
@@ -19,10 +45,56 @@ class ActivityLogRepository:
         await session.refresh(activity)
         return activity
 
+    async def create_many(
+        self, session: AsyncSession, entries: Sequence[ActivityLogCreate]
+    ) -> int:
+        """Insert ``entries`` with one multi-row statement.
+
+        Nothing is read back. Entries of tasks deleted since they were recorded
+        keep a null ``task_id``, as ``ON DELETE SET NULL`` would have left them.
+        """
+        if not entries:
+            return 0
+        source = values(
+            column("position", Integer),
+            column("task_id", Integer),
+            column("action", String),
+            column("performed_by", Integer),
+            column("details", JSONB(none_as_null=True)),
+            column("created_at", DateTime),
+            name="entry",
+        ).data(
+            [
+                (i, e.task_id, e.action, e.performed_by, e.details, e.created_at)
+                for i, e in enumerate(entries)
+            ]
+        )
+        # ``None`` is rendered as a bare NULL, which Postgres types as text
+        # when a whole VALUES column is null.
+        task_id = cast(source.c.task_id, Integer)
+        rows = (
+            select(
+                Task.id,
+                source.c.action,
+                cast(source.c.performed_by, Integer),
+                cast(source.c.details, JSONB),
+                source.c.created_at,
+            )
+            .select_from(source.outerjoin(Task, Task.id == task_id))
+            .order_by(source.c.position)
+        )
+        stmt = insert(ActivityLog).from_select(
+            ["task_id", "action", "performed_by", "details", "created_at"], rows
+        )
+        await session.execute(stmt)
+        await session.commit()
+        return len(entries)
+
     async def get(
         self, session: AsyncSession, activity_id: int
     ) -> Optional[ActivityLog]:
-        return await session.get(ActivityLog, activity_id)
+        stmt = select(ActivityLog).where(ActivityLog.id == activity_id)
+        return await session.scalar(stmt)
 
     async def list(
         self,
@@ -60,3 +132,101 @@ class ActivityLogRepository:
             stmt = stmt.where(ActivityLog.task_id == task_id)
         result = await session.execute(stmt)
         return {action: count for action, count in result.all()}
+
+    async def create_partition(
+        self, session: AsyncSession, month: date
+    ) -> Optional[str]:
+        """Create the partition of ``month`` and commit; return its name.
+
+        Returns ``None`` when the partition already exists. Rows of that month
+        that already landed in the default partition are moved into the new
+        one, which Postgres would otherwise refuse to create. Runs in a
+        savepoint, so a failure leaves ``session`` usable for other months.
+        """
+        schema = ActivityLog.__table__.schema
+        month = _month(month)
+        following = _next_month(month)
+        name = f"activity_logs_p{month:%Y_%m}"
+        parent = f"{schema}.activity_logs"
+        default = f"{schema}.activity_logs_default"
+        bounds = (
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        in_month = {
+            "start": datetime.combine(month, datetime.min.time()),
+            "end": datetime.combine(following, datetime.min.time()),
+        }
+        async with session.begin_nested():
+            exists = await session.scalar(
+                text("SELECT to_regclass(:name) IS NOT NULL"),
+                {"name": f"{schema}.{name}"},
+            )
+            if exists:
+                return None
+            # Keeps new rows of the month out of the default partition until
+            # the new partition is attached.
+            await session.execute(text(f"LOCK TABLE {default} IN EXCLUSIVE MODE"))
+            stray = await session.scalar(
+                text(
+                    f"SELECT EXISTS (SELECT 1 FROM {default} "
+                    "WHERE created_at >= :start AND created_at < :end)"
+                ),
+                in_month,
+            )
+            if not stray:
+                await session.execute(
+                    text(f"CREATE TABLE {schema}.{name} PARTITION OF {parent} {bounds}")
+                )
+            else:
+                await session.execute(
+                    text(
+                        f"CREATE TABLE {schema}.{name} "
+                        f"(LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                    )
+                )
+                await session.execute(
+                    text(
+                        f"WITH moved AS (DELETE FROM {default} "
+                        "WHERE created_at >= :start AND created_at < :end "
+                        f"RETURNING *) INSERT INTO {schema}.{name} "
+                        "SELECT * FROM moved"
+                    ),
+                    in_month,
+                )
+                await session.execute(
+                    text(
+                        f"ALTER TABLE {parent} "
+                        f"ATTACH PARTITION {schema}.{name} {bounds}"
+                    )
+                )
+        await session.commit()
+        return name
+
+    async def drop_partitions_before(
+        self, session: AsyncSession, cutoff: datetime
+    ) -> list[str]:
+        """Drop the monthly partitions holding only rows older than ``cutoff``.
+
+        Whole partitions are dropped, so expiring a month costs the same
+        whatever its size and leaves no dead rows behind.
+        """
+        schema = ActivityLog.__table__.schema
+        result = await session.scalars(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(:parent)"
+            ),
+            {"parent": f"{schema}.activity_logs"},
+        )
+        dropped = []
+        for name in sorted(result.all()):
+            match = _PARTITION_NAME.match(name)
+            if not match:
+                continue
+            month = date(int(match[1]), int(match[2]), 1)
+            if datetime.combine(_next_month(month), datetime.min.time()) <= cutoff:
+                await session.execute(text(f"DROP TABLE {schema}.{name}"))
+                dropped.append(name)
+        await session.commit()
+        return dropped
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from typing import Any, Optional
 
 from sqlalchemy import Select, func, select
@@ -10,8 +11,14 @@ from ..domain.schemas import CommentCreate
 
 
 class CommentRepository:
-    async def create(self, session: AsyncSession, comment_in: CommentCreate) -> Comment:
-        comment = Comment(**comment_in.model_dump())
+    async def create(
+        self,
+        session: AsyncSession,
+        comment_in: CommentCreate,
+        *,
+        mentions: Sequence[str] = (),
+    ) -> Comment:
+        comment = Comment(**comment_in.model_dump(), mentions=list(mentions))
         session.add(comment)
         await session.commit()
         await session.refresh(comment)
@@ -38,6 +45,29 @@ class CommentRepository:
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def list_mentioning(
+        self,
+        session: AsyncSession,
+        username: str,
+        *,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[Comment]:
+        """Return the comments mentioning ``username``, newest first.
+
+        ``mentions @> '["username"]'`` is answered by the GIN index on
+        ``mentions``.
+        """
+        stmt: Select[tuple[Comment]] = (
+            select(Comment)
+            .where(Comment.mentions.contains([username]))
+            .order_by(Comment.created_at.desc(), Comment.id.desc())
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await session.execute(stmt)
+        return result.scalars().all()
+
     async def update(
         self, session: AsyncSession, comment_id: int, data: dict[str, Any]
     ) -> Optional[Comment]:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any, Optional
 
 from sqlalchemy import Select, func, select
@@ -38,6 +39,20 @@ class ListRepository:
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def ids_in_project(self, session: AsyncSession, project_id: int) -> set[int]:
+        stmt = select(List.id).where(List.project_id == project_id)
+        return set((await session.scalars(stmt)).all())
+
+    async def fingerprint(
+        self, session: AsyncSession, project_id: int
+    ) -> tuple[int, Optional[datetime]]:
+        """Return the list count and latest ``updated_at`` of a project."""
+        stmt = select(func.count(List.id), func.max(List.updated_at)).where(
+            List.project_id == project_id
+        )
+        count, updated_at = (await session.execute(stmt)).one()
+        return count, updated_at
+
     async def update(
         self, session: AsyncSession, list_id: int, data: dict[str, Any]
     ) -> Optional[List]:
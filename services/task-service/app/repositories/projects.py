@@ -3,10 +3,12 @@ from __future__ import annotations
 from typing import Any, Optional
 
 from sqlalchemy import Select, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..domain.models import Project, Task
+from ..domain.models import Project, ProjectTaskCounter, Task
 from ..domain.schemas import ProjectCreate
+from .stats import ProjectStatsRepository
 
 
 class ProjectRepository:
@@ -15,6 +17,8 @@ class ProjectRepository:
     async def create(self, session: AsyncSession, project_in: ProjectCreate) -> Project:
         project = Project(**project_in.model_dump())
         session.add(project)
+        await session.flush()
+        await ProjectStatsRepository().create(session, project.id)
         await session.commit()
         await session.refresh(project)
         return project
@@ -34,6 +38,10 @@ class ProjectRepository:
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def ids(self, session: AsyncSession) -> list[int]:
+        result = await session.scalars(select(Project.id).order_by(Project.id))
+        return list(result.all())
+
     async def update(
         self,
         session: AsyncSession,
@@ -67,3 +75,25 @@ class ProjectRepository:
         )
         result = await session.execute(stmt)
         return {status: count for status, count in result.all()}
+
+    async def reserve_task_numbers(
+        self, session: AsyncSession, project_id: int, count: int = 1
+    ) -> range:
+        """Atomically reserve the next ``count`` task numbers of a project.
+
+        The counter row stays locked until the caller's transaction ends, so
+        concurrent creates never receive the same number and a rolled back
+        insert releases its numbers again.
+        """
+        stmt = (
+            insert(ProjectTaskCounter)
+            .values(project_id=project_id, last_value=count)
+            .on_conflict_do_update(
+                index_elements=[ProjectTaskCounter.project_id],
+                set_={"last_value": ProjectTaskCounter.last_value + count},
+            )
+            .returning(ProjectTaskCounter.last_value)
+        )
+        result = await session.execute(stmt)
+        last = result.scalar_one()
+        return range(last - count + 1, last + 1)
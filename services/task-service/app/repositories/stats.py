@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Optional
+
+from sqlalchemy import (
+    ColumnElement,
+    DateTime,
+    Integer,
+    any_,
+    func,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..domain.models import Project, ProjectTaskStats, Task
+from ..domain.schemas import Complexity, Priority, Status
+
+# Summary columns counting the tasks by the value of a task column.
+COUNTED_COLUMNS = {
+    "status": "by_status",
+    "priority": "by_priority",
+    "complexity": "by_complexity",
+}
+# Task columns whose changes move a task between summary counters.
+TRACKED_FIELDS = frozenset({"project_id", "due_date", "completed_at", *COUNTED_COLUMNS})
+
+
+def week_start(now: datetime) -> datetime:
+    """Midnight of the Monday starting the week of ``now``."""
+    return (now - timedelta(days=now.weekday())).replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+class StatsDelta:
+    """Counter changes of a task write, grouped by project.
+
+    ``overdue`` and ``completed_this_week`` are judged as of ``now``; tasks
+    that cross a due date or leave the week without being written are left to
+    the reconciler.
+    """
+
+    def __init__(self, now: Optional[datetime] = None) -> None:
+        self.now = now or datetime.utcnow()
+        self.week_start = week_start(self.now)
+        self.columns: defaultdict[int, Counter[str]] = defaultdict(Counter)
+        self.counts: defaultdict[int, Counter[tuple[str, str]]] = defaultdict(Counter)
+
+    def add(self, task: Mapping[str, Any], n: int = 1) -> None:
+        """Count ``n`` tasks with the tracked values of ``task``."""
+        project_id = task["project_id"]
+        columns = self.columns[project_id]
+        columns["total"] += n
+        completed_at = _naive_utc(task.get("completed_at"))
+        due_date = _naive_utc(task.get("due_date"))
+        if completed_at is None and due_date is not None and due_date < self.now:
+            columns["overdue"] += n
+        if completed_at is not None and completed_at >= self.week_start:
+            columns["completed_this_week"] += n
+        for field, name in COUNTED_COLUMNS.items():
+            value = task.get(field)
+            if value is not None:
+                self.counts[project_id][name, getattr(value, "value", value)] += n
+
+    def move(self, old: Mapping[str, Any], new: Mapping[str, Any]) -> None:
+        """Move one task from the counters of ``old`` to those of ``new``."""
+        if any(old.get(field) != new.get(field) for field in TRACKED_FIELDS):
+            self.add(old, -1)
+            self.add(new)
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Task columns store naive UTC; schemas may still carry an offset.
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def tracked_values(task: Any) -> dict[str, Any]:
+    """Return the :data:`TRACKED_FIELDS` of a task or task schema."""
+    return {field: getattr(task, field) for field in TRACKED_FIELDS}
+
+
+def _counts(column: ColumnElement[Any], values: type[Enum]) -> ColumnElement[Any]:
+    pairs: list[Any] = []
+    for value in values:
+        pairs += [value.value, func.count(Task.id).filter(column == value.value)]
+    return func.jsonb_build_object(*pairs)
+
+
+def _zeros(values: type[Enum]) -> dict[str, int]:
+    return {value.value: 0 for value in values}
+
+
+class ProjectStatsRepository:
+    async def get(
+        self, session: AsyncSession, project_id: int
+    ) -> Optional[ProjectTaskStats]:
+        return await session.get(ProjectTaskStats, project_id, populate_existing=True)
+
+    async def create(self, session: AsyncSession, project_id: int) -> None:
+        """Add the summary row of a new, empty project."""
+        session.add(
+            ProjectTaskStats(
+                project_id=project_id,
+                total=0,
+                by_status=_zeros(Status),
+                by_priority=_zeros(Priority),
+                by_complexity=_zeros(Complexity),
+                overdue=0,
+                completed_this_week=0,
+                refreshed_at=datetime.utcnow(),
+            )
+        )
+        await session.flush()
+
+    async def apply(self, session: AsyncSession, delta: StatsDelta) -> None:
+        """Add ``delta`` to the summary rows in the caller's transaction.
+
+        A missing row is left to :meth:`refresh`. Rows are updated in project
+        order so concurrent writes cannot deadlock on them.
+        """
+        table = ProjectTaskStats.__table__
+        for project_id in sorted(delta.columns.keys() | delta.counts.keys()):
+            values: dict[str, Any] = {
+                name: table.c[name] + n
+                for name, n in delta.columns[project_id].items()
+                if n
+            }
+            changes: defaultdict[str, list[Any]] = defaultdict(list)
+            for (name, key), n in delta.counts[project_id].items():
+                if n:
+                    current = func.coalesce(table.c[name][key].astext.cast(Integer), 0)
+                    changes[name] += [key, current + n]
+            for name, pairs in changes.items():
+                values[name] = table.c[name].op("||")(func.jsonb_build_object(*pairs))
+            if values:
+                await session.execute(
+                    update(table).where(table.c.project_id == project_id).values(values)
+                )
+
+    async def refresh(
+        self,
+        session: AsyncSession,
+        project_ids: Optional[Iterable[int]] = None,
+        *,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """Recompute the summary rows of ``project_ids``, or of every project.
+
+        Reads every task of the given projects, so task writes use
+        :meth:`apply` and this is left to the periodic reconciler, which
+        catches tasks that became overdue or left the week since their last
+        write. The existing rows are
+        locked before the tasks are read, so deltas of concurrent writes are
+        either counted or applied on top instead of being overwritten. Nothing
+        is committed here.
+        """
+        now = now or datetime.utcnow()
+        summary = (
+            select(
+                Project.id,
+                func.count(Task.id),
+                _counts(Task.status, Status),
+                _counts(Task.priority, Priority),
+                _counts(Task.complexity, Complexity),
+                func.count(Task.id).filter(
+                    Task.completed_at.is_(None), Task.due_date < now
+                ),
+                func.count(Task.id).filter(Task.completed_at >= week_start(now)),
+                literal(now, DateTime),
+            )
+            .select_from(Project)
+            .outerjoin(Task, Task.project_id == Project.id)
+            .group_by(Project.id)
+        )
+        lock = (
+            select(ProjectTaskStats.project_id)
+            .order_by(ProjectTaskStats.project_id)
+            .with_for_update()
+        )
+        if project_ids is not None:
+            ids = sorted(set(project_ids))
+            if not ids:
+                return
+            in_ids = any_(literal(ids, ARRAY(Integer)))
+            summary = summary.where(Project.id == in_ids)
+            lock = lock.where(ProjectTaskStats.project_id == in_ids)
+        # The summary below is a new statement, so under READ COMMITTED it sees
+        # every write that committed while waiting for these locks.
+        await session.execute(lock)
+        columns = [
+            "project_id",
+            "total",
+            "by_status",
+            "by_priority",
+            "by_complexity",
+            "overdue",
+            "completed_this_week",
+            "refreshed_at",
+        ]
+        stmt = insert(ProjectTaskStats).from_select(columns, summary)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProjectTaskStats.project_id],
+            set_={name: stmt.excluded[name] for name in columns[1:]},
+        )
+        await session.execute(stmt)
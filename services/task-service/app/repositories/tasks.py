@@ -1,22 +1,128 @@
 from __future__ import annotations
 
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import Select, func, select
+from sqlalchemy import (
+    REAL,
+    ColumnElement,
+    Integer,
+    Select,
+    and_,
+    any_,
+    case,
+    column,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    tuple_,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from ..domain.models import Task
+from ..domain.models import SEARCH_CONFIG, List, Task
 from ..domain.schemas import TaskCreate
+from .stats import (
+    TRACKED_FIELDS,
+    ProjectStatsRepository,
+    StatsDelta,
+    tracked_values,
+)
 
 
 class TaskRepository:
+    """Task persistence.
+
+    Every write also adjusts the ``project_task_stats`` counters of the
+    projects it touched, in the same transaction.
+    """
+
+    def __init__(self, stats: ProjectStatsRepository | None = None) -> None:
+        self.stats = stats or ProjectStatsRepository()
+
     async def create(self, session: AsyncSession, task_in: TaskCreate) -> Task:
         task = Task(**task_in.model_dump())
         session.add(task)
+        await session.flush()
+        delta = StatsDelta()
+        delta.add(tracked_values(task))
+        await self.stats.apply(session, delta)
         await session.commit()
         await session.refresh(task)
         return task
 
+    async def create_many(
+        self, session: AsyncSession, tasks_in: list[TaskCreate]
+    ) -> list[Task]:
+        """Insert ``tasks_in`` with one multi-row ``INSERT ... RETURNING``."""
+        if not tasks_in:
+            return []
+        stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+        result = await session.scalars(stmt, [t.model_dump() for t in tasks_in])
+        tasks = list(result.all())
+        delta = StatsDelta()
+        for task in tasks:
+            delta.add(tracked_values(task))
+        await self.stats.apply(session, delta)
+        await session.commit()
+        return tasks
+
+    async def copy_many(
+        self, session: AsyncSession, tasks_in: Sequence[TaskCreate]
+    ) -> int:
+        """Load validated tasks with ``COPY`` and commit.
+
+        Much faster than ``INSERT`` for large imports, but nothing is read
+        back.
+        """
+        if not tasks_in:
+            return 0
+        now = datetime.utcnow()
+        records = [
+            (
+                task_in.project_id,
+                task_in.list_id,
+                task_in.title,
+                task_in.description,
+                task_in.status.value,
+                task_in.complexity.value if task_in.complexity else None,
+                task_in.priority.value if task_in.priority else None,
+                task_in.start_date,
+                task_in.due_date,
+                task_in.completed_at,
+                task_in.code,
+                # The connection's jsonb codec takes serialized JSON.
+                json.dumps(task_in.assignee_ids),
+                task_in.sector_id,
+                json.dumps(task_in.tags),
+                now,
+                now,
+            )
+            for task_in in tasks_in
+        ]
+        connection = await session.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            Task.__table__.name,
+            schema_name=Task.__table__.schema,
+            columns=COPY_COLUMNS,
+            records=records,
+        )
+        delta = StatsDelta()
+        for task_in in tasks_in:
+            delta.add(tracked_values(task_in))
+        await self.stats.apply(session, delta)
+        await session.commit()
+        return len(records)
+
     async def get(self, session: AsyncSession, task_id: int) -> Optional[Task]:
         return await session.get(Task, task_id)
 
@@ -33,58 +139,310 @@ class TaskRepository:
         complexity: Optional[str] = None,
         priority: Optional[str] = None,
         search: Optional[str] = None,
+        search_mode: str = "fulltext",
+        timeliness: Optional[str] = None,
         order_by: Optional[str] = None,
         order: str = "asc",
         offset: int = 0,
         limit: int | None = 100,
+        now: Optional[datetime] = None,
     ) -> list[Task]:
-        stmt: Select[tuple[Task]] = select(Task)
-        if project_id is not None:
-            stmt = stmt.where(Task.project_id == project_id)
-        if list_id is not None:
-            stmt = stmt.where(Task.list_id == list_id)
-        if status is not None:
-            stmt = stmt.where(Task.status == status)
-        if tag is not None:
-            stmt = stmt.where(Task.tags.contains([tag]))
-        if assignee_id is not None:
-            stmt = stmt.where(Task.assignee_ids.contains([assignee_id]))
-        if sector_id is not None:
-            stmt = stmt.where(Task.sector_id == sector_id)
-        if complexity is not None:
-            stmt = stmt.where(Task.complexity == complexity)
-        if priority is not None:
-            stmt = stmt.where(Task.priority == priority)
-        if search is not None:
-            stmt = stmt.where(Task.title.ilike(f"%{search}%"))
-        if order_by is not None and hasattr(Task, order_by):
-            column = getattr(Task, order_by)
-            stmt = stmt.order_by(
-                column.asc() if order.lower() == "asc" else column.desc()
-            )
+        rows, _ = await self.list_page(
+            session,
+            project_id=project_id,
+            list_id=list_id,
+            status=status,
+            tag=tag,
+            assignee_id=assignee_id,
+            sector_id=sector_id,
+            complexity=complexity,
+            priority=priority,
+            search=search,
+            search_mode=search_mode,
+            timeliness=timeliness,
+            order_by=order_by,
+            order=order,
+            offset=offset,
+            limit=limit,
+            now=now,
+            with_total=False,
+        )
+        return [task for task, _ in rows]
+
+    async def list_page(
+        self,
+        session: AsyncSession,
+        *,
+        project_id: Optional[int] = None,
+        list_id: Optional[int] = None,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        assignee_id: Optional[int] = None,
+        sector_id: Optional[int] = None,
+        complexity: Optional[str] = None,
+        priority: Optional[str] = None,
+        search: Optional[str] = None,
+        search_mode: str = "fulltext",
+        timeliness: Optional[str] = None,
+        order_by: Optional[str] = None,
+        order: str = "asc",
+        offset: int = 0,
+        limit: int | None = 100,
+        now: Optional[datetime] = None,
+        after: Optional[tuple[Any, int]] = None,
+        with_total: bool = True,
+    ) -> tuple[list[tuple[Task, Any]], Optional[int]]:
+        """Return one page of ``(task, sort key)`` rows and the total matches.
+
+        The total is computed by the database with ``COUNT(*) OVER ()`` so
+        only the requested page is transferred. ``after`` is the
+        ``(sort key, id)`` of the last row already returned and switches to
+        keyset pagination; NULL sort keys come last in ascending and first
+        in descending order, matching Postgres defaults.
+        """
+        now = now or datetime.utcnow()
+        filters: dict[str, Any] = {
+            "project_id": project_id,
+            "list_id": list_id,
+            "status": status,
+            "tag": tag,
+            "assignee_id": assignee_id,
+            "sector_id": sector_id,
+            "complexity": complexity,
+            "priority": priority,
+            "search": search,
+            "search_mode": search_mode,
+            "timeliness": timeliness,
+            "now": now,
+        }
+        column = self._sort_column(order_by, now, search, search_mode)
+        stmt: Select[Any] = self._apply_filters(select(Task), **filters)
+        stmt = self._apply_order(stmt, column, order=order, after=after)
+        stmt = stmt.add_columns(
+            (column if column is not None else null()).label("sort_key")
+        )
+        if with_total:
+            stmt = stmt.add_columns(func.count().over().label("total"))
         stmt = stmt.offset(offset)
         if limit is not None:
             stmt = stmt.limit(limit)
-        result = await session.execute(stmt)
-        return result.scalars().all()
+        rows = (await session.execute(stmt)).all()
+        page = [(row[0], row.sort_key) for row in rows]
+        if not with_total:
+            return page, None
+        if rows:
+            return page, rows[0].total
+        if offset == 0 or after is not None:
+            return [], 0
+        # The page is past the end, so the window function produced no row
+        # to read the total from.
+        count_stmt = self._apply_filters(select(func.count(Task.id)), **filters)
+        result = await session.execute(count_stmt)
+        return [], result.scalar_one()
+
+    async def stream(
+        self,
+        session: AsyncSession,
+        *,
+        project_id: Optional[int] = None,
+        list_id: Optional[int] = None,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        assignee_id: Optional[int] = None,
+        sector_id: Optional[int] = None,
+        complexity: Optional[str] = None,
+        priority: Optional[str] = None,
+        search: Optional[str] = None,
+        search_mode: str = "fulltext",
+        timeliness: Optional[str] = None,
+        order_by: Optional[str] = None,
+        order: str = "asc",
+        now: Optional[datetime] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Task]]:
+        """Yield every matching task in chunks of ``chunk_size``.
+
+        Rows are fetched from a server-side cursor, so only one chunk is held
+        in memory at a time. The caller must keep ``session`` open until the
+        iteration ends.
+        """
+        now = now or datetime.utcnow()
+        column = self._sort_column(order_by, now, search, search_mode)
+        stmt = self._apply_filters(
+            select(Task),
+            project_id=project_id,
+            list_id=list_id,
+            status=status,
+            tag=tag,
+            assignee_id=assignee_id,
+            sector_id=sector_id,
+            complexity=complexity,
+            priority=priority,
+            search=search,
+            search_mode=search_mode,
+            timeliness=timeliness,
+            now=now,
+        )
+        stmt = self._apply_order(stmt, column, order=order)
+        result = await session.stream_scalars(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        async for chunk in result.partitions():
+            yield chunk
 
     async def update(
-        self, session: AsyncSession, task_id: int, data: dict[str, Any]
+        self,
+        session: AsyncSession,
+        task_id: int,
+        data: dict[str, Any],
+        *,
+        previous: Optional[dict[int, dict[str, Any]]] = None,
     ) -> Optional[Task]:
-        task = await self.get(session, task_id)
-        if not task:
-            return None
-        for key, value in data.items():
-            setattr(task, key, value)
+        if not data:
+            return await self.get(session, task_id)
+        tasks = await self.update_many(session, [task_id], data, previous=previous)
+        return tasks[0] if tasks else None
+
+    async def update_many(
+        self,
+        session: AsyncSession,
+        task_ids: list[int],
+        data: dict[str, Any],
+        *,
+        previous: Optional[dict[int, dict[str, Any]]] = None,
+    ) -> list[Task]:
+        """Apply ``data`` to every task in ``task_ids`` with one statement.
+
+        Runs ``UPDATE ... WHERE id = ANY(:ids) RETURNING *``; ids that do not
+        exist are simply absent from the result. When ``previous`` is given it
+        is filled with the values the updated fields had before, read by the
+        same statement.
+        """
+        if not task_ids:
+            return []
+        if previous is None and TRACKED_FIELDS.intersection(data):
+            # The old values are needed to move the tasks between counters.
+            previous = {}
+        ids = Task.id == any_(literal(task_ids, ARRAY(Integer)))
+        stmt = update(Task).values(**data)
+        if previous is None:
+            stmt = stmt.where(ids).returning(Task)
+            tasks = list((await session.scalars(stmt)).all())
+        else:
+            before = self._locked(list(data)).where(ids).cte("before")
+            stmt = stmt.where(Task.id == before.c.id)
+            tasks = await self._execute_with_previous(
+                session, stmt, before, list(data), previous
+            )
+        await self._apply_moves(session, tasks, previous)
         await session.commit()
-        await session.refresh(task)
-        return task
+        return tasks
+
+    async def update_each(
+        self,
+        session: AsyncSession,
+        patches: dict[int, dict[str, Any]],
+        *,
+        previous: Optional[dict[int, dict[str, Any]]] = None,
+    ) -> list[Task]:
+        """Apply a separate patch to each task id in one transaction.
+
+        Patches touching the same set of fields are joined to a ``VALUES``
+        list and applied with a single ``UPDATE ... FROM ... RETURNING``.
+        ``previous`` is filled as in :meth:`update_many`.
+        """
+        if previous is None and any(
+            TRACKED_FIELDS.intersection(data) for data in patches.values()
+        ):
+            previous = {}
+        groups: dict[tuple[str, ...], list[tuple[int, dict[str, Any]]]] = {}
+        for task_id, data in patches.items():
+            groups.setdefault(tuple(sorted(data)), []).append((task_id, data))
+        tasks: list[Task] = []
+        for fields, rows in groups.items():
+            if not fields:
+                stmt = select(Task).where(Task.id.in_([tid for tid, _ in rows]))
+                tasks.extend((await session.scalars(stmt)).all())
+                continue
+            columns = Task.__table__.c
+            source = values(
+                column("id", Integer),
+                *(column(field, columns[field].type) for field in fields),
+                name="patch",
+            ).data([(tid, *(data[field] for field in fields)) for tid, data in rows])
+            stmt = (
+                update(Task)
+                .values({field: source.c[field] for field in fields})
+                .execution_options(synchronize_session=False)
+            )
+            if previous is None:
+                stmt = stmt.where(Task.id == source.c.id).returning(Task)
+                tasks.extend((await session.scalars(stmt)).all())
+                continue
+            before = (
+                self._locked(list(fields))
+                .where(Task.id.in_([tid for tid, _ in rows]))
+                .cte("before")
+            )
+            stmt = stmt.where(Task.id == source.c.id, Task.id == before.c.id)
+            tasks.extend(
+                await self._execute_with_previous(
+                    session, stmt, before, list(fields), previous
+                )
+            )
+        await self._apply_moves(session, tasks, previous)
+        await session.commit()
+        return tasks
+
+    async def _apply_moves(
+        self,
+        session: AsyncSession,
+        tasks: list[Task],
+        previous: Optional[dict[int, dict[str, Any]]],
+    ) -> None:
+        if not previous:
+            return
+        delta = StatsDelta()
+        for task in tasks:
+            new = tracked_values(task)
+            delta.move({**new, **previous.get(task.id, {})}, new)
+        await self.stats.apply(session, delta)
+
+    @staticmethod
+    def _locked(fields: list[str]) -> Select[Any]:
+        columns = Task.__table__.c
+        return select(
+            columns.id, *(columns[field] for field in fields)
+        ).with_for_update()
+
+    @staticmethod
+    async def _execute_with_previous(
+        session: AsyncSession,
+        stmt: Any,
+        before: Any,
+        fields: list[str],
+        previous: dict[int, dict[str, Any]],
+    ) -> list[Task]:
+        # ``before`` locks the rows first, so it holds exactly the values this
+        # statement overwrites.
+        stmt = stmt.returning(
+            Task, *(before.c[field].label(f"before_{field}") for field in fields)
+        ).execution_options(synchronize_session=False)
+        tasks = []
+        for task, *old in (await session.execute(stmt)).all():
+            previous[task.id] = dict(zip(fields, old))
+            tasks.append(task)
+        return tasks
 
     async def delete(self, session: AsyncSession, task_id: int) -> bool:
         task = await self.get(session, task_id)
         if not task:
             return False
         await session.delete(task)
+        await session.flush()
+        delta = StatsDelta()
+        delta.add(tracked_values(task), -1)
+        await self.stats.apply(session, delta)
         await session.commit()
         return True
 
@@ -101,3 +459,209 @@ class TaskRepository:
         stmt = select(func.count(Task.id)).where(Task.project_id == project_id)
         result = await session.execute(stmt)
         return result.scalar_one()
+
+    async def board(
+        self, session: AsyncSession, project_id: int, *, per_list: int
+    ) -> list[tuple[List, Optional[Task], int]]:
+        """Return the lists of a project with the first ``per_list`` tasks of each.
+
+        Rows come ordered by list ``position`` and then task ``id``, each with
+        the list's task total; a list without tasks yields one row whose task
+        is ``None``. Tasks are ranked per list with a window function, so the
+        whole board is read in a single query.
+        """
+        ranked = (
+            select(
+                Task,
+                func.row_number()
+                .over(partition_by=Task.list_id, order_by=Task.id)
+                .label("rank"),
+                func.count().over(partition_by=Task.list_id).label("total"),
+            )
+            .where(Task.project_id == project_id, Task.list_id.is_not(None))
+            .subquery()
+        )
+        task = aliased(Task, ranked)
+        stmt = (
+            select(List, task, func.coalesce(ranked.c.total, 0))
+            .outerjoin(
+                ranked,
+                and_(ranked.c.list_id == List.id, ranked.c.rank <= per_list),
+            )
+            .where(List.project_id == project_id)
+            .order_by(List.position.asc().nulls_last(), List.id, ranked.c.rank)
+        )
+        result = await session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def fingerprint(
+        self, session: AsyncSession, project_id: int
+    ) -> tuple[int, Optional[datetime]]:
+        """Return the task count and latest ``updated_at`` of a project."""
+        stmt = select(func.count(Task.id), func.max(Task.updated_at)).where(
+            Task.project_id == project_id
+        )
+        count, updated_at = (await session.execute(stmt)).one()
+        return count, updated_at
+
+    def _apply_filters(
+        self,
+        stmt: Select[Any],
+        *,
+        project_id: Optional[int],
+        list_id: Optional[int],
+        status: Optional[str],
+        tag: Optional[str],
+        assignee_id: Optional[int],
+        sector_id: Optional[int],
+        complexity: Optional[str],
+        priority: Optional[str],
+        search: Optional[str],
+        search_mode: str,
+        timeliness: Optional[str],
+        now: datetime,
+    ) -> Select[Any]:
+        if project_id is not None:
+            stmt = stmt.where(Task.project_id == project_id)
+        if list_id is not None:
+            stmt = stmt.where(Task.list_id == list_id)
+        if status is not None:
+            stmt = stmt.where(Task.status == status)
+        if tag is not None:
+            stmt = stmt.where(Task.tags.contains([tag]))
+        if assignee_id is not None:
+            stmt = stmt.where(Task.assignee_ids.contains([assignee_id]))
+        if sector_id is not None:
+            stmt = stmt.where(Task.sector_id == sector_id)
+        if complexity is not None:
+            stmt = stmt.where(Task.complexity == complexity)
+        if priority is not None:
+            stmt = stmt.where(Task.priority == priority)
+        if search is not None:
+            stmt = stmt.where(search_condition(search, search_mode))
+        if timeliness is not None:
+            stmt = stmt.where(timeliness_expression(now) == timeliness)
+        return stmt
+
+    def _apply_order(
+        self,
+        stmt: Select[Any],
+        column: Optional[ColumnElement[Any]],
+        *,
+        order: str,
+        after: Optional[tuple[Any, int]] = None,
+    ) -> Select[Any]:
+        descending = order.lower() == "desc"
+        if after is not None:
+            stmt = stmt.where(self._keyset_condition(column, after, descending))
+        id_order = Task.id.desc() if descending else Task.id.asc()
+        if column is None:
+            return stmt.order_by(id_order)
+        return stmt.order_by(column.desc() if descending else column.asc(), id_order)
+
+    def _sort_column(
+        self,
+        order_by: Optional[str],
+        now: datetime,
+        search: Optional[str],
+        search_mode: str,
+    ) -> Optional[ColumnElement[Any]]:
+        if order_by == "timeliness":
+            return timeliness_rank(now)
+        if order_by == "relevance" and search is not None:
+            return search_rank(search, search_mode)
+        if order_by is not None and order_by in SORTABLE_COLUMNS:
+            return getattr(Task, order_by)
+        return None
+
+    def _keyset_condition(
+        self,
+        column: Optional[ColumnElement[Any]],
+        after: tuple[Any, int],
+        descending: bool,
+    ) -> ColumnElement[bool]:
+        key, last_id = after
+        if column is None:
+            return Task.id < last_id if descending else Task.id > last_id
+        if key is None:
+            after_null = and_(
+                column.is_(None), Task.id < last_id if descending else Task.id > last_id
+            )
+            return or_(after_null, column.is_not(None)) if descending else after_null
+        # Bind the key with the column's type so that list values of the JSONB
+        # columns are serialized like the column itself.
+        key = literal(key, column.type)
+        if descending:
+            return tuple_(column, Task.id) < tuple_(key, last_id)
+        return or_(tuple_(column, Task.id) > tuple_(key, last_id), column.is_(None))
+
+
+SORTABLE_COLUMNS = frozenset(Task.__table__.columns.keys()) - {"search_vector"}
+# Column order of the records built by ``TaskRepository.copy_many``.
+COPY_COLUMNS = [
+    "project_id",
+    "list_id",
+    "title",
+    "description",
+    "status",
+    "complexity",
+    "priority",
+    "start_date",
+    "due_date",
+    "completed_at",
+    "code",
+    "assignee_ids",
+    "sector_id",
+    "tags",
+    "created_at",
+    "updated_at",
+]
+TIMELINESS_RANK: dict[Optional[str], int] = {
+    "on_time": 0,
+    "late": 1,
+    "overdue": 2,
+    None: 3,
+}
+
+
+def _timeliness_conditions(now: datetime) -> list[tuple[ColumnElement[bool], str]]:
+    finished = and_(Task.completed_at.is_not(None), Task.due_date.is_not(None))
+    return [
+        (and_(finished, Task.completed_at <= Task.due_date), "on_time"),
+        (finished, "late"),
+        (and_(Task.completed_at.is_(None), Task.due_date < now), "overdue"),
+    ]
+
+
+def timeliness_expression(now: datetime) -> ColumnElement[Optional[str]]:
+    """SQL equivalent of ``TaskService._calculate_timeliness``."""
+    return case(*_timeliness_conditions(now), else_=None)
+
+
+def timeliness_rank(now: datetime) -> ColumnElement[int]:
+    """Sort key for timeliness, see :data:`TIMELINESS_RANK`."""
+    return case(
+        *(
+            (condition, TIMELINESS_RANK[label])
+            for condition, label in _timeliness_conditions(now)
+        ),
+        else_=TIMELINESS_RANK[None],
+    )
+
+
+def search_condition(search: str, mode: str) -> ColumnElement[bool]:
+    """Match ``search`` with the full-text vector or by title trigrams."""
+    if mode == "fuzzy":
+        return Task.title.op("%")(search)
+    return Task.search_vector.op("@@")(_search_query(search))
+
+
+def search_rank(search: str, mode: str) -> ColumnElement[float]:
+    """Relevance of a task for ``search``; higher is better."""
+    if mode == "fuzzy":
+        return func.similarity(Task.title, search, type_=REAL)
+    return func.ts_rank_cd(Task.search_vector, _search_query(search), type_=REAL)
+
+
+def _search_query(search: str) -> ColumnElement[Any]:
+    return func.websearch_to_tsquery(literal(SEARCH_CONFIG, type_=REGCONFIG), search)
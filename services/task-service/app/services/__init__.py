@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from .comments import CommentService
+from .imports import TaskImporter
 from .lists import ListService
 from .projects import ProjectService
 from .tasks import TaskService
@@ -11,5 +12,6 @@ __all__ = [
     "ListService",
     "TaskService",
     "CommentService",
+    "TaskImporter",
     "UserServiceClient",
 ]
@@ -0,0 +1,191 @@
+"""Buffered writer for :class:`~app.domain.models.ActivityLog` entries."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.database import async_session_factory
+from ..core.logging import user_id_ctx_var
+from ..core.metrics import ACTIVITY_LOG_DROPPED
+from ..core.settings import settings
+from ..domain.schemas import ActivityLogCreate
+from ..repositories import ActivityLogRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityLogWriter:
+    """Queue activity log entries in memory and insert them in batches.
+
+    :meth:`emit` never touches the database, so requests do not wait for an
+    extra commit. A background task writes the queued entries with one
+    multi-row insert as soon as ``batch_size`` are waiting, or at the latest
+    ``flush_interval`` seconds after the first one arrived. :meth:`stop`
+    writes whatever is left. Entries arriving while ``max_pending`` are queued
+    are dropped and counted in ``activity_log_dropped_total``.
+    """
+
+    def __init__(
+        self,
+        *,
+        flush_interval: float,
+        batch_size: int,
+        max_pending: int,
+        session_factory: Callable[[], AsyncSession] = async_session_factory,
+        repository: ActivityLogRepository | None = None,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.repository = repository or ActivityLogRepository()
+        self._queue: asyncio.Queue[ActivityLogCreate] = asyncio.Queue(max_pending)
+        self._task: asyncio.Task[None] | None = None
+        self._writing: asyncio.Future[None] | None = None
+
+    def emit(
+        self,
+        action: str,
+        task_id: Optional[int],
+        details: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Queue an entry performed by the current request's user."""
+        user_id = user_id_ctx_var.get()
+        entry = ActivityLogCreate(
+            task_id=task_id,
+            action=action,
+            performed_by=int(user_id) if user_id and user_id.isdigit() else None,
+            details=to_jsonable_python(details) if details else None,
+        )
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            ACTIVITY_LOG_DROPPED.inc()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write the remaining entries."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._writing is not None:
+            await self._writing
+            self._writing = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write every queued entry now."""
+        while not self._queue.empty():
+            await self._write(self._take([]))
+
+    def _take(self, batch: list[ActivityLogCreate]) -> list[ActivityLogCreate]:
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = self._take([await self._queue.get()])
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+                self._take(batch)
+            # Shielded so that stopping the writer mid-insert does not lose the
+            # batch; stop() waits for it before the final flush.
+            self._writing = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._writing)
+            self._writing = None
+
+    async def _write(self, batch: list[ActivityLogCreate]) -> None:
+        try:
+            async with self.session_factory() as session:
+                await self.repository.create_many(session, batch)
+        except Exception:
+            logger.exception("Could not write %d activity log entries", len(batch))
+            ACTIVITY_LOG_DROPPED.inc(len(batch))
+
+
+activity_log = ActivityLogWriter(
+    flush_interval=settings.activity_log_flush_interval,
+    batch_size=settings.activity_log_batch_size,
+    max_pending=settings.activity_log_max_pending,
+)
+
+
+async def maintain_activity_log_partitions(
+    *,
+    now: datetime | None = None,
+    session_factory: Callable[[], AsyncSession] = async_session_factory,
+    repository: ActivityLogRepository | None = None,
+) -> None:
+    """Create the upcoming monthly partitions and drop the expired ones.
+
+    A partition expires once all of its month is older than
+    ``ACTIVITY_LOG_RETENTION_DAYS``; ``0`` keeps every partition. Each month
+    is created on its own, so one failing month does not keep the following
+    ones from being created.
+    """
+    now = now or datetime.utcnow()
+    repository = repository or ActivityLogRepository()
+    async with session_factory() as session:
+        created = []
+        month = now.date().replace(day=1)
+        for _ in range(settings.activity_log_partitions_ahead + 1):
+            try:
+                name = await repository.create_partition(session, month)
+            except SQLAlchemyError:
+                logger.exception(
+                    "Could not create the activity log partition of %s",
+                    f"{month:%Y-%m}",
+                )
+            else:
+                if name:
+                    created.append(name)
+            month = (month + timedelta(days=32)).replace(day=1)
+        dropped = []
+        if settings.activity_log_retention_days > 0:
+            cutoff = now - timedelta(days=settings.activity_log_retention_days)
+            dropped = await repository.drop_partitions_before(session, cutoff)
+    if created or dropped:
+        logger.info(
+            "Activity log partitions created: %s, dropped: %s", created, dropped
+        )
+
+
+async def run_activity_log_maintenance(interval: float) -> None:
+    """Maintain the activity log partitions every ``interval`` seconds."""
+    while True:
+        try:
+            await maintain_activity_log_partitions()
+        except Exception:  # pragma: no cover - logged and retried
+            logger.exception("Could not maintain activity log partitions")
+        await asyncio.sleep(interval)
+
+
+__all__ = [
+    "ActivityLogWriter",
+    "activity_log",
+    "maintain_activity_log_partitions",
+    "run_activity_log_maintenance",
+]
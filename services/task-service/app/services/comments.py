@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 from typing import Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,6 +9,13 @@ from ..domain.models import Comment
 from ..domain.schemas import CommentCreate
 from ..repositories import CommentRepository
 
+MENTION_PATTERN = re.compile(r"@([A-Za-z0-9_]+)")
+
+
+def parse_mentions(text: str) -> list[str]:
+    """Extract the distinct ``@user`` mentions from ``text`` in order."""
+    return list(dict.fromkeys(MENTION_PATTERN.findall(text)))
+
 
 class CommentService:
     """Business logic for :class:`~app.domain.models.Comment`."""
@@ -16,7 +24,9 @@ class CommentService:
         self.repository = repository or CommentRepository()
 
     async def create(self, session: AsyncSession, comment_in: CommentCreate) -> Comment:
-        return await self.repository.create(session, comment_in)
+        return await self.repository.create(
+            session, comment_in, mentions=parse_mentions(comment_in.content)
+        )
 
     async def get(self, session: AsyncSession, comment_id: int) -> Optional[Comment]:
         return await self.repository.get(session, comment_id)
@@ -28,9 +38,18 @@ class CommentService:
             session, task_id, offset=offset, limit=limit
         )
 
+    async def list_mentioning(
+        self, session: AsyncSession, username: str, *, offset: int = 0, limit: int = 100
+    ) -> list[Comment]:
+        return await self.repository.list_mentioning(
+            session, username, offset=offset, limit=limit
+        )
+
     async def update(
         self, session: AsyncSession, comment_id: int, data: dict[str, Any]
     ) -> Optional[Comment]:
+        if "content" in data:
+            data = {**data, "mentions": parse_mentions(data["content"])}
         return await self.repository.update(session, comment_id, data)
 
     async def delete(self, session: AsyncSession, comment_id: int) -> bool:
@@ -0,0 +1,248 @@
+"""Bulk import of tasks from CSV or NDJSON files."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import Any, TextIO
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.settings import settings
+from ..domain.schemas import (
+    TaskBatchError,
+    TaskCreate,
+    TaskFileFormat,
+    TaskImportReport,
+)
+from ..repositories import (
+    ListRepository,
+    ProjectRepository,
+    TaskRepository,
+)
+from .activity import ActivityLogWriter, activity_log
+from .user_client import UserServiceClient
+
+# Columns read from each row; anything else (e.g. the ``id``, ``code`` and
+# timeliness columns of an export) is ignored.
+IMPORT_FIELDS = frozenset(TaskCreate.model_fields) - {"project_id", "code"}
+# CSV cells holding lists, written as ``a;b`` like the CSV export does.
+LIST_FIELDS = frozenset({"assignee_ids", "tags"})
+
+ProgressCallback = Callable[[int, TaskImportReport], None]
+
+
+class ProjectNotFoundError(LookupError):
+    """Raised when importing into a project that does not exist."""
+
+
+class UnreadableRow:
+    """Stands in for the rest of a file that could not be read."""
+
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+
+def _until_unreadable(rows: Iterable[Any]) -> Iterator[Any]:
+    try:
+        yield from rows
+    except (UnicodeDecodeError, csv.Error) as exc:
+        yield UnreadableRow(str(exc))
+
+
+def read_rows(file: TextIO, format: TaskFileFormat) -> Iterator[Any]:
+    """Yield the raw rows of ``file`` without holding it in memory."""
+    if format == TaskFileFormat.CSV:
+        yield from csv.DictReader(file)
+        return
+    for line in file:
+        if line.strip():
+            yield line
+
+
+def parse_row(row: Any, project_id: int) -> TaskCreate:
+    """Validate one raw row of :func:`read_rows` as a task of ``project_id``."""
+    if isinstance(row, str):
+        row = json.loads(row)
+        if not isinstance(row, dict):
+            raise ValueError("Row must be a JSON object")
+        data = {key: value for key, value in row.items() if key in IMPORT_FIELDS}
+    else:
+        data = {}
+        for key, value in row.items():
+            if key not in IMPORT_FIELDS or value in (None, ""):
+                continue
+            data[key] = value.split(";") if key in LIST_FIELDS else value
+    return TaskCreate.model_validate({**data, "project_id": project_id})
+
+
+class TaskImporter:
+    """Load large task files into a project.
+
+    Rows are validated ``batch_size`` at a time. For each batch the assignees
+    and sectors are checked with one user service lookup each, task codes are
+    reserved as a block and the accepted rows are written with ``COPY`` and
+    committed, so an interrupted import keeps the batches already loaded.
+    Rejected rows are reported by their zero-based position in the file; if
+    the file cannot be read to the end, the rows before the failure are still
+    imported and the failure is reported as an ``INVALID_FILE`` row. When the
+    user service cannot be reached the rows of the current batch are reported
+    as ``USER_SERVICE_ERROR`` and the import stops, leaving the committed
+    batches in place; ``processed`` tells where to resume. Reading and
+    validating a batch runs in a worker thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        project_repository: ProjectRepository | None = None,
+        list_repository: ListRepository | None = None,
+        task_repository: TaskRepository | None = None,
+        user_client: UserServiceClient | None = None,
+        activity: ActivityLogWriter | None = None,
+        batch_size: int | None = None,
+        max_errors: int | None = None,
+    ) -> None:
+        self.project_repository = project_repository or ProjectRepository()
+        self.list_repository = list_repository or ListRepository()
+        self.task_repository = task_repository or TaskRepository()
+        self.user_client = user_client or UserServiceClient()
+        self.activity = activity or activity_log
+        self.batch_size = batch_size or settings.import_batch_size
+        self.max_errors = (
+            settings.import_max_errors if max_errors is None else max_errors
+        )
+
+    async def run(
+        self,
+        session: AsyncSession,
+        project_id: int,
+        rows: Iterable[Any],
+        *,
+        on_progress: ProgressCallback | None = None,
+    ) -> TaskImportReport:
+        project = await self.project_repository.get(session, project_id)
+        if not project:
+            raise ProjectNotFoundError(project_id)
+        slug = project.slug.upper()
+        list_ids = await self.list_repository.ids_in_project(session, project_id)
+
+        report = TaskImportReport(processed=0, imported=0, failed=0, errors=[])
+        numbered = enumerate(_until_unreadable(rows))
+        while True:
+            read, candidates = await asyncio.to_thread(
+                self._parse_batch, numbered, project_id, list_ids, report
+            )
+            if not read:
+                break
+            stopped = False
+            try:
+                accepted = await self._check_users(candidates, report)
+            except HTTPException as exc:
+                for index, _ in candidates:
+                    self._reject(report, index, "USER_SERVICE_ERROR", str(exc.detail))
+                accepted, stopped = [], True
+            if accepted:
+                numbers = await self.project_repository.reserve_task_numbers(
+                    session, project_id, len(accepted)
+                )
+                report.imported += await self.task_repository.copy_many(
+                    session,
+                    [
+                        task_in.model_copy(update={"code": f"{slug}-{number}"})
+                        for task_in, number in zip(accepted, numbers)
+                    ],
+                )
+            report.processed += read
+            if on_progress is not None:
+                on_progress(report.processed, report)
+            if stopped:
+                break
+
+        report.errors.sort(key=lambda error: error.index)
+        self.activity.emit(
+            "tasks.imported",
+            None,
+            {
+                "project_id": project_id,
+                "imported": report.imported,
+                "failed": report.failed,
+            },
+        )
+        return report
+
+    def _parse_batch(
+        self,
+        numbered: Iterator[tuple[int, Any]],
+        project_id: int,
+        list_ids: set[int],
+        report: TaskImportReport,
+    ) -> tuple[int, list[tuple[int, TaskCreate]]]:
+        batch = list(islice(numbered, self.batch_size))
+        candidates: list[tuple[int, TaskCreate]] = []
+        for index, row in batch:
+            if isinstance(row, UnreadableRow):
+                self._reject(report, index, "INVALID_FILE", row.message)
+                continue
+            try:
+                task_in = parse_row(row, project_id)
+            except ValidationError as exc:
+                message = "; ".join(error["msg"] for error in exc.errors())
+                self._reject(report, index, "VALIDATION_ERROR", message)
+                continue
+            except ValueError as exc:
+                self._reject(report, index, "VALIDATION_ERROR", str(exc))
+                continue
+            if task_in.list_id is not None and task_in.list_id not in list_ids:
+                self._reject(report, index, "INVALID_LIST", "Invalid list_id")
+                continue
+            candidates.append((index, task_in))
+        return len(batch), candidates
+
+    async def _check_users(
+        self, candidates: list[tuple[int, TaskCreate]], report: TaskImportReport
+    ) -> list[TaskCreate]:
+        if not candidates:
+            return []
+        missing_users, sectors = await asyncio.gather(
+            self.user_client.missing_users(
+                uid for _, task_in in candidates for uid in task_in.assignee_ids
+            ),
+            self.user_client.sector_names(
+                task_in.sector_id
+                for _, task_in in candidates
+                if task_in.sector_id is not None
+            ),
+        )
+        accepted: list[TaskCreate] = []
+        for index, task_in in candidates:
+            missing = sorted(missing_users.intersection(task_in.assignee_ids))
+            if missing:
+                self._reject(
+                    report,
+                    index,
+                    "INVALID_ASSIGNEES",
+                    f"Invalid assignee_ids: {missing}",
+                )
+            elif task_in.sector_id is not None and task_in.sector_id not in sectors:
+                self._reject(report, index, "INVALID_SECTOR", "Invalid sector_id")
+            else:
+                accepted.append(task_in)
+        return accepted
+
+    def _reject(
+        self, report: TaskImportReport, index: int, code: str, message: str
+    ) -> None:
+        report.failed += 1
+        if len(report.errors) < self.max_errors:
+            report.errors.append(
+                TaskBatchError(index=index, code=code, message=message)
+            )
+
+
+__all__ = ["ProjectNotFoundError", "TaskImporter", "parse_row", "read_rows"]
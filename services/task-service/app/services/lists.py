@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -33,6 +34,11 @@ class ListService:
             session, project_id, offset=offset, limit=limit
         )
 
+    async def fingerprint(
+        self, session: AsyncSession, project_id: int
+    ) -> tuple[int, Optional[datetime]]:
+        return await self.repository.fingerprint(session, project_id)
+
     async def update(
         self, session: AsyncSession, list_id: int, data: dict[str, Any]
     ) -> Optional[List]:
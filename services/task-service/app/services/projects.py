@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+from collections.abc import Callable
 from typing import Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..domain.models import Project
+from ..core.database import async_session_factory
+from ..domain.models import Project, ProjectTaskStats
 from ..domain.schemas import ProjectCreate
-from ..repositories import ProjectRepository
+from ..repositories import ProjectRepository, ProjectStatsRepository
+
+logger = logging.getLogger(__name__)
 
 
 class ProjectService:
     """Business logic for :class:`~app.domain.models.Project`."""
 
-    def __init__(self, repository: ProjectRepository | None = None) -> None:
+    def __init__(
+        self,
+        repository: ProjectRepository | None = None,
+        stats: ProjectStatsRepository | None = None,
+    ) -> None:
         self.repository = repository or ProjectRepository()
+        self.stats = stats or ProjectStatsRepository()
 
     async def create(self, session: AsyncSession, project_in: ProjectCreate) -> Project:
         return await self.repository.create(session, project_in)
@@ -41,3 +52,49 @@ class ProjectService:
         self, session: AsyncSession, project_id: int
     ) -> dict[str, int]:
         return await self.repository.task_statistics(session, project_id)
+
+    async def stats_summary(
+        self, session: AsyncSession, project_id: int
+    ) -> Optional[ProjectTaskStats]:
+        return await self.stats.get(session, project_id)
+
+    async def reconcile_stats(
+        self, session: AsyncSession, *, chunk_size: int = 100
+    ) -> None:
+        """Recompute the task summary of every project.
+
+        Projects are recomputed and committed ``chunk_size`` at a time, so task
+        writes only wait for the summary rows of the current chunk.
+        """
+        project_ids = await self.repository.ids(session)
+        for start in range(0, len(project_ids), chunk_size):
+            await self.stats.refresh(session, project_ids[start : start + chunk_size])
+            await session.commit()
+
+
+async def reconcile_project_stats(
+    *,
+    session_factory: Callable[[], AsyncSession] = async_session_factory,
+    service: ProjectService | None = None,
+) -> None:
+    """Recompute every project's task summary.
+
+    Writes keep the counters current; this catches tasks becoming overdue or
+    leaving the current week, and any write made outside the repositories.
+    """
+    service = service or ProjectService()
+    async with session_factory() as session:
+        await service.reconcile_stats(session)
+
+
+async def run_project_stats_reconciler(interval: float) -> None:
+    """Reconcile the project task summaries every ``interval`` seconds."""
+    while True:
+        try:
+            await reconcile_project_stats()
+        except Exception:  # pragma: no cover - logged and retried
+            logger.exception("Could not reconcile project task stats")
+        await asyncio.sleep(interval)
+
+
+__all__ = ["ProjectService", "reconcile_project_stats", "run_project_stats_reconciler"]
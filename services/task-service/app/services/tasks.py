@@ -1,15 +1,52 @@
 from __future__ import annotations
 
+import asyncio
+import csv
+import io
+import logging
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, Iterable, List, Optional
 
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.database import async_session_factory
+from ..core.metrics import TASKS_STATUS_GAUGE
+from ..core.pagination import Cursor, InvalidCursorError, decode_cursor, encode_cursor
 from ..domain.models import Task
-from ..domain.schemas import Status, TaskCreate, TaskRead
+from ..domain.schemas import (
+    BoardList,
+    Complexity,
+    Priority,
+    Status,
+    TaskBatchError,
+    TaskCreate,
+    TaskFileFormat,
+    TaskRead,
+)
 from ..repositories import ProjectRepository, TaskRepository
+from ..repositories.tasks import SORTABLE_COLUMNS
+from .activity import ActivityLogWriter, activity_log
 from .user_client import UserServiceClient
 
+logger = logging.getLogger(__name__)
+
+
+def _csv_row(task: TaskRead) -> list[Any]:
+    row = []
+    for value in task.model_dump(mode="json").values():
+        if isinstance(value, list):
+            value = ";".join(str(item) for item in value)
+        row.append(value)
+    return row
+
+
+def _csv_lines(rows: Iterable[list[Any]]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
 
 class TaskService:
     """Business logic for :class:`~app.domain.models.Task`."""
@@ -19,10 +56,12 @@ class TaskService:
         repository: TaskRepository | None = None,
         project_repository: ProjectRepository | None = None,
         user_client: UserServiceClient | None = None,
+        activity: ActivityLogWriter | None = None,
     ) -> None:
         self.repository = repository or TaskRepository()
         self.project_repository = project_repository or ProjectRepository()
         self.user_client = user_client or UserServiceClient()
+        self.activity = activity or activity_log
 
     async def create(self, session: AsyncSession, task_in: TaskCreate) -> TaskRead:
         await self._validate_assignees(task_in.assignee_ids)
@@ -30,8 +69,90 @@ class TaskService:
         code = await self._generate_code(session, task_in.project_id)
         task_with_code = task_in.model_copy(update={"code": code})
         task = await self.repository.create(session, task_with_code)
+        self.activity.emit(
+            "task.created", task.id, task_with_code.model_dump(exclude_defaults=True)
+        )
         return self._to_read_model(task)
 
+    async def create_many(
+        self, session: AsyncSession, project_id: int, items: List[dict[str, Any]]
+    ) -> tuple[list[TaskRead], list[TaskBatchError]]:
+        """Create many tasks at once, reporting invalid items individually.
+
+        Assignees and sectors of all items are checked with one user service
+        lookup each, task codes are reserved as a block and the valid tasks
+        are inserted in a single statement.
+        """
+        project = await self.project_repository.get(session, project_id)
+        if not project:
+            raise ValueError("Project not found")
+
+        errors: list[TaskBatchError] = []
+        candidates: list[tuple[int, TaskCreate]] = []
+        for index, item in enumerate(items):
+            try:
+                task_in = TaskCreate.model_validate({**item, "project_id": project_id})
+            except ValidationError as exc:
+                message = "; ".join(error["msg"] for error in exc.errors())
+                errors.append(
+                    TaskBatchError(
+                        index=index, code="VALIDATION_ERROR", message=message
+                    )
+                )
+                continue
+            candidates.append((index, task_in))
+
+        missing_users, sectors = await asyncio.gather(
+            self.user_client.missing_users(
+                uid for _, task_in in candidates for uid in task_in.assignee_ids
+            ),
+            self.user_client.sector_names(
+                task_in.sector_id
+                for _, task_in in candidates
+                if task_in.sector_id is not None
+            ),
+        )
+        accepted: list[TaskCreate] = []
+        for index, task_in in candidates:
+            missing = sorted(missing_users.intersection(task_in.assignee_ids))
+            if missing:
+                errors.append(
+                    TaskBatchError(
+                        index=index,
+                        code="INVALID_ASSIGNEES",
+                        message=f"Invalid assignee_ids: {missing}",
+                    )
+                )
+            elif task_in.sector_id is not None and task_in.sector_id not in sectors:
+                errors.append(
+                    TaskBatchError(
+                        index=index, code="INVALID_SECTOR", message="Invalid sector_id"
+                    )
+                )
+            else:
+                accepted.append(task_in)
+
+        tasks: list[Task] = []
+        if accepted:
+            numbers = await self.project_repository.reserve_task_numbers(
+                session, project_id, len(accepted)
+            )
+            slug = project.slug.upper()
+            tasks = await self.repository.create_many(
+                session,
+                [
+                    task_in.model_copy(update={"code": f"{slug}-{number}"})
+                    for task_in, number in zip(accepted, numbers)
+                ],
+            )
+        for task, task_in in zip(tasks, accepted):
+            self.activity.emit(
+                "task.created", task.id, task_in.model_dump(exclude_defaults=True)
+            )
+        now = datetime.utcnow()
+        errors.sort(key=lambda error: error.index)
+        return [self._to_read_model(task, now) for task in tasks], errors
+
     async def get(self, session: AsyncSession, task_id: int) -> Optional[TaskRead]:
         task = await self.repository.get(session, task_id)
         if not task:
@@ -51,13 +172,92 @@ class TaskService:
         complexity: Optional[str] = None,
         priority: Optional[str] = None,
         search: Optional[str] = None,
+        search_mode: str = "fulltext",
         timeliness: Optional[str] = None,
         order_by: Optional[str] = None,
         order: str = "asc",
         offset: int = 0,
         limit: int = 100,
-    ) -> tuple[list[TaskRead], int]:
-        tasks = await self.repository.list(
+        cursor: Optional[str] = None,
+    ) -> tuple[list[TaskRead], Optional[int], Optional[str]]:
+        """Return a page of tasks, the total match count and the next cursor.
+
+        With ``cursor`` the page is fetched by keyset instead of ``offset``
+        and the total is not computed, so every page costs the same. Search
+        results are ranked by relevance unless ``order_by`` is given.
+        """
+        now = datetime.utcnow()
+        order_by, order = self._resolve_order(order_by, order, search)
+        filters: dict[str, Any] = {
+            "project_id": project_id,
+            "list_id": list_id,
+            "status": status,
+            "tag": tag,
+            "assignee_id": assignee_id,
+            "sector_id": sector_id,
+            "complexity": complexity,
+            "priority": priority,
+            "search": search,
+            "search_mode": search_mode,
+            "timeliness": timeliness,
+            "order_by": order_by,
+            "order": order,
+            "now": now,
+        }
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            if position.order_by != order_by or position.order != order:
+                raise InvalidCursorError("Cursor does not match the requested order")
+            rows, total = await self.repository.list_page(
+                session,
+                **filters,
+                limit=limit + 1,
+                after=(position.key, position.id),
+                with_total=False,
+            )
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+        else:
+            rows, total = await self.repository.list_page(
+                session, **filters, offset=offset, limit=limit
+            )
+            has_more = offset + len(rows) < (total or 0)
+        data = [self._to_read_model(task, now) for task, _ in rows]
+        next_cursor = None
+        if has_more and rows:
+            last, key = rows[-1]
+            next_cursor = encode_cursor(Cursor(order_by, order, key, last.id))
+        return data, total, next_cursor
+
+    async def export(
+        self,
+        session: AsyncSession,
+        *,
+        format: TaskFileFormat = TaskFileFormat.NDJSON,
+        project_id: Optional[int] = None,
+        list_id: Optional[int] = None,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        assignee_id: Optional[int] = None,
+        sector_id: Optional[int] = None,
+        complexity: Optional[str] = None,
+        priority: Optional[str] = None,
+        search: Optional[str] = None,
+        search_mode: str = "fulltext",
+        timeliness: Optional[str] = None,
+        order_by: Optional[str] = None,
+        order: str = "asc",
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[bytes]:
+        """Encode every matching task, one chunk of rows at a time.
+
+        Filters and ordering are those of :meth:`list`. Each yielded chunk
+        holds at most ``chunk_size`` rows, so memory use does not grow with
+        the number of tasks exported.
+        """
+        now = datetime.utcnow()
+        order_by, order = self._resolve_order(order_by, order, search)
+        chunks = self.repository.stream(
             session,
             project_id=project_id,
             list_id=list_id,
@@ -68,37 +268,68 @@ class TaskService:
             complexity=complexity,
             priority=priority,
             search=search,
-            order_by=None if order_by == "timeliness" else order_by,
+            search_mode=search_mode,
+            timeliness=timeliness,
+            order_by=order_by,
             order=order,
-            offset=0,
-            limit=None,
+            now=now,
+            chunk_size=chunk_size,
         )
-        data = [self._to_read_model(task) for task in tasks]
-        if timeliness is not None:
-            data = [t for t in data if t.timeliness == timeliness]
-        if order_by == "timeliness":
-            order_map = {"on_time": 0, "late": 1, "overdue": 2, None: 3}
-            data.sort(
-                key=lambda t: order_map.get(t.timeliness, 3),
-                reverse=order.lower() == "desc",
-            )
-        total = len(data)
-        data = data[offset : offset + limit]
-        return data, total
+        if format == TaskFileFormat.CSV:
+            yield _csv_lines([list(TaskRead.model_fields)])
+        async for tasks in chunks:
+            reads = [self._to_read_model(task, now) for task in tasks]
+            if format == TaskFileFormat.CSV:
+                yield _csv_lines(_csv_row(read) for read in reads)
+            else:
+                yield b"".join(
+                    read.model_dump_json().encode() + b"\n" for read in reads
+                )
+
+    async def board(
+        self, session: AsyncSession, project_id: int, *, per_list: int = 20
+    ) -> list[BoardList]:
+        """Return the lists of a project, each with its first tasks and total."""
+        now = datetime.utcnow()
+        lists: dict[int, BoardList] = {}
+        for lst, task, total in await self.repository.board(
+            session, project_id, per_list=per_list
+        ):
+            board_list = lists.get(lst.id)
+            if board_list is None:
+                board_list = lists[lst.id] = BoardList.model_construct(
+                    id=lst.id,
+                    project_id=lst.project_id,
+                    name=lst.name,
+                    position=lst.position,
+                    created_at=lst.created_at,
+                    updated_at=lst.updated_at,
+                    tasks=[],
+                    total=total,
+                )
+            if task is not None:
+                board_list.tasks.append(self._to_read_model(task, now))
+        return list(lists.values())
 
     async def move(
         self, session: AsyncSession, task_id: int, *, list_id: int
     ) -> Optional[TaskRead]:
-        task = await self.repository.update(session, task_id, {"list_id": list_id})
+        previous: dict[int, dict[str, Any]] = {}
+        task = await self.repository.update(
+            session, task_id, {"list_id": list_id}, previous=previous
+        )
         if not task:
             return None
+        self._record_changes("task.moved", [task], previous)
         return self._to_read_model(task)
 
     async def archive(self, session: AsyncSession, task_id: int) -> Optional[TaskRead]:
         data = {"status": Status.COMPLETED.value, "completed_at": datetime.utcnow()}
-        task = await self.repository.update(session, task_id, data)
+        previous: dict[int, dict[str, Any]] = {}
+        task = await self.repository.update(session, task_id, data, previous=previous)
         if not task:
             return None
+        self._record_changes("task.archived", [task], previous)
         return self._to_read_model(task)
 
     async def update(
@@ -108,33 +339,146 @@ class TaskService:
             await self._validate_assignees(data["assignee_ids"])
         if "sector_id" in data:
             await self._validate_sector(data["sector_id"])
-        task = await self.repository.update(session, task_id, data)
+        previous: dict[int, dict[str, Any]] = {}
+        task = await self.repository.update(session, task_id, data, previous=previous)
         if not task:
             return None
+        self._record_changes("task.updated", [task], previous)
         return self._to_read_model(task)
 
+    async def move_many(
+        self, session: AsyncSession, task_ids: List[int], *, list_id: int
+    ) -> list[TaskRead]:
+        previous: dict[int, dict[str, Any]] = {}
+        tasks = await self.repository.update_many(
+            session, task_ids, {"list_id": list_id}, previous=previous
+        )
+        self._record_changes("task.moved", tasks, previous)
+        return self._to_read_models(tasks)
+
+    async def archive_many(
+        self, session: AsyncSession, task_ids: List[int]
+    ) -> list[TaskRead]:
+        data = {"status": Status.COMPLETED.value, "completed_at": datetime.utcnow()}
+        previous: dict[int, dict[str, Any]] = {}
+        tasks = await self.repository.update_many(
+            session, task_ids, data, previous=previous
+        )
+        self._record_changes("task.archived", tasks, previous)
+        return self._to_read_models(tasks)
+
+    async def update_many(
+        self, session: AsyncSession, task_ids: List[int], data: dict[str, Any]
+    ) -> list[TaskRead]:
+        """Apply the same ``data`` to all ``task_ids``."""
+        await self._validate_patches([data])
+        if not data:
+            tasks = await self.repository.update_each(
+                session, {task_id: {} for task_id in task_ids}
+            )
+        else:
+            previous: dict[int, dict[str, Any]] = {}
+            tasks = await self.repository.update_many(
+                session, task_ids, data, previous=previous
+            )
+            self._record_changes("task.updated", tasks, previous)
+        return self._to_read_models(tasks)
+
+    async def update_each(
+        self, session: AsyncSession, patches: dict[int, dict[str, Any]]
+    ) -> list[TaskRead]:
+        """Apply a separate patch to each task id."""
+        await self._validate_patches(patches.values())
+        previous: dict[int, dict[str, Any]] = {}
+        tasks = await self.repository.update_each(session, patches, previous=previous)
+        self._record_changes("task.updated", tasks, previous)
+        return self._to_read_models(tasks)
+
     async def delete(self, session: AsyncSession, task_id: int) -> bool:
-        return await self.repository.delete(session, task_id)
+        deleted = await self.repository.delete(session, task_id)
+        if deleted:
+            self.activity.emit("task.deleted", task_id, {"id": task_id})
+        return deleted
 
     async def count_by_status(
         self, session: AsyncSession, *, project_id: Optional[int] = None
     ) -> dict[str, int]:
         return await self.repository.count_by_status(session, project_id=project_id)
 
+    async def fingerprint(
+        self, session: AsyncSession, project_id: int
+    ) -> tuple[int, Optional[datetime]]:
+        return await self.repository.fingerprint(session, project_id)
+
     async def _generate_code(self, session: AsyncSession, project_id: int) -> str:
         project = await self.project_repository.get(session, project_id)
         if not project:
             raise ValueError("Project not found")
-        seq = await self.repository.count_in_project(session, project_id) + 1
-        return f"{project.slug.upper()}-{seq}"
+        numbers = await self.project_repository.reserve_task_numbers(
+            session, project_id
+        )
+        return f"{project.slug.upper()}-{numbers[0]}"
 
-    def _to_read_model(self, task: Task) -> TaskRead:
-        data = TaskRead.model_validate(task)
-        metrics = self._calculate_timeliness(task)
-        return data.model_copy(update=metrics)
+    def _record_changes(
+        self,
+        action: str,
+        tasks: Iterable[Task],
+        previous: dict[int, dict[str, Any]],
+    ) -> None:
+        """Queue a ``{field: [old, new]}`` entry for each task that changed."""
+        for task in tasks:
+            changes = {
+                field: [old, getattr(task, field)]
+                for field, old in previous.get(task.id, {}).items()
+                if old != getattr(task, field)
+            }
+            if changes:
+                self.activity.emit(action, task.id, {"changes": changes})
 
-    def _calculate_timeliness(self, task: Task) -> dict[str, Any]:
+    @staticmethod
+    def _resolve_order(
+        order_by: Optional[str], order: str, search: Optional[str]
+    ) -> tuple[Optional[str], str]:
+        """Normalise ``order_by``; searches are ranked by relevance by default."""
+        order = "desc" if order.lower() == "desc" else "asc"
+        if search is not None and order_by in (None, "relevance"):
+            return "relevance", "desc"
+        if order_by not in SORTABLE_COLUMNS and order_by != "timeliness":
+            return None, order
+        return order_by, order
+
+    def _to_read_models(self, tasks: List[Task]) -> list[TaskRead]:
         now = datetime.utcnow()
+        return [self._to_read_model(task, now) for task in tasks]
+
+    def _to_read_model(self, task: Task, now: datetime | None = None) -> TaskRead:
+        # Rows come from the database and were validated on write, so the
+        # read model is built without running the validators again.
+        return TaskRead.model_construct(
+            id=task.id,
+            code=task.code,
+            project_id=task.project_id,
+            list_id=task.list_id,
+            title=task.title,
+            description=task.description,
+            status=Status(task.status),
+            complexity=Complexity(task.complexity) if task.complexity else None,
+            priority=Priority(task.priority) if task.priority else None,
+            start_date=task.start_date,
+            due_date=task.due_date,
+            completed_at=task.completed_at,
+            assignee_ids=task.assignee_ids or [],
+            sector_id=task.sector_id,
+            tags=task.tags or [],
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            **self._calculate_timeliness(task, now),
+        )
+
+    def _calculate_timeliness(
+        self, task: Task, now: datetime | None = None
+    ) -> dict[str, Any]:
+        now = now or datetime.utcnow()
         start = task.start_date
         due = task.due_date
         completed = task.completed_at
@@ -156,7 +500,41 @@ class TaskService:
     async def _validate_assignees(self, assignee_ids: List[int]) -> None:
         await self.user_client.verify_users(assignee_ids)
 
+    async def _validate_patches(self, patches: Iterable[dict[str, Any]]) -> None:
+        assignee_ids: set[int] = set()
+        sector_ids: set[int] = set()
+        for data in patches:
+            assignee_ids.update(data.get("assignee_ids") or [])
+            if data.get("sector_id") is not None:
+                sector_ids.add(data["sector_id"])
+        await asyncio.gather(
+            self.user_client.verify_users(assignee_ids),
+            self.user_client.verify_sectors(sector_ids),
+        )
+
     async def _validate_sector(self, sector_id: int | None) -> None:
         if sector_id is None:
             return
         await self.user_client.get_sector_name(sector_id)
+
+
+async def refresh_task_status_metrics(
+    *,
+    session_factory: Callable[[], AsyncSession] = async_session_factory,
+    service: TaskService | None = None,
+) -> None:
+    """Replace the task status snapshot reported by ``/metrics``."""
+    service = service or TaskService()
+    async with session_factory() as session:
+        counts = await service.count_by_status(session)
+    TASKS_STATUS_GAUGE.set_counts(counts)
+
+
+async def run_task_status_refresher(interval: float) -> None:
+    """Refresh the task status snapshot every ``interval`` seconds."""
+    while True:
+        try:
+            await refresh_task_status_metrics()
+        except Exception:  # pragma: no cover - logged and retried
+            logger.exception("Could not refresh task status metrics")
+        await asyncio.sleep(interval)
@@ -5,62 +5,152 @@ from typing import Iterable
 import httpx
 from fastapi import HTTPException, status
 
+from ..core.cache import MISSING, TTLCache
+from ..core.http import get_http_client, service_url
 from ..core.settings import settings
 
+# Process-wide caches of user service lookups. ``True``/``False`` record
+# whether a user exists; sector names map to ``None`` for unknown sectors.
+# Negative entries expire sooner so newly created records show up quickly.
+USER_CACHE: TTLCache[int, bool] = TTLCache(
+    "users", maxsize=settings.user_cache_max_size, ttl=settings.user_cache_ttl
+)
+SECTOR_CACHE: TTLCache[int, str | None] = TTLCache(
+    "sectors", maxsize=settings.user_cache_max_size, ttl=settings.user_cache_ttl
+)
+
+
+def invalidate_user(user_id: int) -> None:
+    USER_CACHE.invalidate(user_id)
+
+
+def invalidate_sector(sector_id: int) -> None:
+    SECTOR_CACHE.invalidate(sector_id)
+
+
+def clear_caches() -> None:
+    USER_CACHE.clear()
+    SECTOR_CACHE.clear()
+
 
 class UserServiceClient:
     """Client for interacting with the user service."""
 
-    def __init__(self, base_url: str | None = None, timeout: float = 5.0) -> None:
+    def __init__(
+        self,
+        base_url: str | None = None,
+        timeout: float = 5.0,
+        http_client: httpx.AsyncClient | None = None,
+        negative_ttl: float | None = None,
+    ) -> None:
         self.base_url = base_url or str(settings.user_service_base_url)
         self.timeout = timeout
-        self._sector_cache: dict[int, str] = {}
-        self._user_cache: set[int] = set()
+        self.negative_ttl = (
+            settings.user_cache_negative_ttl if negative_ttl is None else negative_ttl
+        )
+        self._http_client = http_client
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        return self._http_client or get_http_client()
 
     async def verify_users(self, user_ids: Iterable[int]) -> None:
-        ids = [uid for uid in user_ids if uid not in self._user_cache]
+        missing = await self.missing_users(user_ids)
+        if missing:
+            raise self._validation_error(f"Invalid assignee_ids: {sorted(missing)}")
+
+    async def missing_users(self, user_ids: Iterable[int]) -> set[int]:
+        """Return the ids in ``user_ids`` unknown to the user service."""
+        missing: set[int] = set()
+        ids: set[int] = set()
+        for uid in set(user_ids):
+            exists = USER_CACHE.get(uid)
+            if exists is MISSING:
+                ids.add(uid)
+            elif not exists:
+                missing.add(uid)
         if not ids:
-            return
+            return missing
         try:
-            async with httpx.AsyncClient(
-                base_url=self.base_url, timeout=self.timeout
-            ) as client:
-                resp = await client.get(
-                    "/users", params={"ids": ",".join(map(str, ids))}
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                found = {user["id"] for user in data.get("users", [])}
-                self._user_cache.update(found)
-                missing = set(ids) - found
-                if missing:
-                    raise self._validation_error(
-                        f"Invalid assignee_ids: {sorted(missing)}"
-                    )
+            resp = await self.http_client.get(
+                service_url(self.base_url, "/users"),
+                params={"ids": ",".join(map(str, sorted(ids)))},
+                timeout=self.timeout,
+            )
+            resp.raise_for_status()
+            data = resp.json()
         except httpx.TimeoutException as exc:
             raise self._validation_error("User service request timed out") from exc
         except httpx.HTTPError as exc:
             raise self._validation_error("User service request failed") from exc
+        found = {user["id"] for user in data.get("users", [])}
+        for uid in ids:
+            if uid in found:
+                USER_CACHE.set(uid, True)
+            else:
+                USER_CACHE.set(uid, False, ttl=self.negative_ttl)
+        return missing | (ids - found)
 
-    async def get_sector_name(self, sector_id: int) -> str:
-        if sector_id in self._sector_cache:
-            return self._sector_cache[sector_id]
+    async def verify_sectors(self, sector_ids: Iterable[int]) -> None:
+        ids = set(sector_ids)
+        missing = ids - (await self.sector_names(ids)).keys()
+        if missing:
+            raise self._validation_error(f"Invalid sector_ids: {sorted(missing)}")
 
-        try:
-            async with httpx.AsyncClient(
-                base_url=self.base_url, timeout=self.timeout
-            ) as client:
-                resp = await client.get(f"/sectors/{sector_id}")
-                if resp.status_code == 404:
-                    raise self._validation_error("Invalid sector_id")
+    async def sector_names(self, sector_ids: Iterable[int]) -> dict[int, str]:
+        """Return the names of the known sectors among ``sector_ids``.
+
+        All sectors are fetched with a single request when any id is not
+        cached yet.
+        """
+        names: dict[int, str | None] = {}
+        for sid in set(sector_ids):
+            names[sid] = SECTOR_CACHE.get(sid)
+        if any(name is MISSING for name in names.values()):
+            try:
+                resp = await self.http_client.get(
+                    service_url(self.base_url, "/sectors"), timeout=self.timeout
+                )
                 resp.raise_for_status()
                 data = resp.json()
-                name = data.get("name")
-                if not name:
-                    raise self._validation_error("Invalid sector data")
+            except httpx.TimeoutException as exc:
+                raise self._validation_error("User service request timed out") from exc
+            except httpx.HTTPError as exc:
+                raise self._validation_error("User service request failed") from exc
+            sectors = data.get("sectors", data) if isinstance(data, dict) else data
+            known = {s["id"]: s["name"] for s in sectors if s.get("name")}
+            for sid, name in known.items():
+                SECTOR_CACHE.set(sid, name)
+            for sid, name in names.items():
+                if name is MISSING:
+                    names[sid] = known.get(sid)
+                    if sid not in known:
+                        SECTOR_CACHE.set(sid, None, ttl=self.negative_ttl)
+        return {sid: name for sid, name in names.items() if name is not None}
+
+    async def get_sector_name(self, sector_id: int) -> str:
+        cached = SECTOR_CACHE.get(sector_id)
+        if cached is None:
+            raise self._validation_error("Invalid sector_id")
+        if cached is not MISSING:
+            return cached
+
+        try:
+            resp = await self.http_client.get(
+                service_url(self.base_url, f"/sectors/{sector_id}"),
+                timeout=self.timeout,
+            )
+            if resp.status_code == 404:
+                SECTOR_CACHE.set(sector_id, None, ttl=self.negative_ttl)
+                raise self._validation_error("Invalid sector_id")
+            resp.raise_for_status()
+            data = resp.json()
+            name = data.get("name")
+            if not name:
+                raise self._validation_error("Invalid sector data")
 
-                self._sector_cache[sector_id] = name
-                return name
+            SECTOR_CACHE.set(sector_id, name)
+            return name
         except httpx.TimeoutException as exc:
             raise self._validation_error("User service request timed out") from exc
         except httpx.HTTPError as exc:
@@ -11,6 +11,9 @@ import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+# The shared ``servicekit`` package sits next to the service directories.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
 
 class DummyUserClient:
     async def verify_users(self, user_ids):  # pragma: no cover - simple stub
@@ -19,6 +22,15 @@ class DummyUserClient:
     async def get_sector_name(self, sector_id):  # pragma: no cover - simple stub
         return "Sector"
 
+    async def missing_users(self, user_ids):  # pragma: no cover - simple stub
+        return {uid for uid in user_ids if uid < 0}
+
+    async def sector_names(self, sector_ids):  # pragma: no cover - simple stub
+        return {sid: "Sector" for sid in sector_ids}
+
+    async def verify_sectors(self, sector_ids):  # pragma: no cover - simple stub
+        return None
+
 
 @pytest_asyncio.fixture()
 async def session(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[AsyncSession]:
@@ -54,7 +66,7 @@ async def session(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[AsyncSession
 async def client(session: AsyncSession) -> AsyncIterator[tuple[AsyncClient, AsyncSession]]:
     sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
     from app.api.tasks import get_task_service
-    from app.core.database import get_session
+    from app.core.database import get_read_session, get_session
     from app.main import app
     from app.services.tasks import TaskService
     sys.path.pop(0)
@@ -63,6 +75,7 @@ async def client(session: AsyncSession) -> AsyncIterator[tuple[AsyncClient, Asyn
         yield session
 
     app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
     app.dependency_overrides[get_task_service] = lambda: TaskService(
         user_client=DummyUserClient()
     )
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app.core.logging import user_id_ctx_var
+from app.domain.schemas import ActivityLogCreate, ProjectCreate, TaskCreate
+from app.repositories import ActivityLogRepository, ProjectRepository
+from app.services.activity import ActivityLogWriter, maintain_activity_log_partitions
+from app.services.tasks import TaskService
+
+sys.path.pop(0)
+
+
+class DummyUserClient:
+    async def verify_users(self, user_ids) -> None:  # pragma: no cover - simple stub
+        return None
+
+    async def get_sector_name(self, sector_id: int) -> str:  # pragma: no cover
+        return "Sector"
+
+
+def _writer(session: AsyncSession, **kwargs) -> ActivityLogWriter:
+    options = {"flush_interval": 60.0, "batch_size": 100, "max_pending": 100}
+    options.update(kwargs)
+    factory = async_sessionmaker(session.bind, expire_on_commit=False)
+    return ActivityLogWriter(session_factory=factory, **options)
+
+
+@pytest.mark.asyncio
+async def test_task_mutations_are_logged_as_diffs(session: AsyncSession) -> None:
+    writer = _writer(session)
+    service = TaskService(user_client=DummyUserClient(), activity=writer)
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    token = user_id_ctx_var.set("7")
+    try:
+        task = await service.create(
+            session, TaskCreate(project_id=project.id, title="a")
+        )
+        await service.update(session, task.id, {"title": "b", "tags": []})
+        await service.archive(session, task.id)
+        other = await service.create(
+            session, TaskCreate(project_id=project.id, title="c")
+        )
+        await service.delete(session, other.id)
+    finally:
+        user_id_ctx_var.reset(token)
+
+    repo = ActivityLogRepository()
+    assert await repo.list(session) == []
+    await writer.stop()
+
+    entries = sorted(await repo.list(session), key=lambda entry: entry.id)
+    assert [entry.action for entry in entries] == [
+        "task.created",
+        "task.updated",
+        "task.archived",
+        "task.created",
+        "task.deleted",
+    ]
+    assert {entry.performed_by for entry in entries} == {7}
+    assert entries[0].details["title"] == "a"
+    assert entries[1].details == {"changes": {"title": ["a", "b"]}}
+    assert entries[2].details["changes"]["status"] == ["pending", "completed"]
+    assert entries[4].task_id is None
+    assert entries[4].details == {"id": other.id}
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_full_batches_and_drops_overflow(
+    session: AsyncSession,
+) -> None:
+    writer = _writer(session, batch_size=2, max_pending=3)
+    writer.start()
+    for _ in range(2):
+        writer.emit("noop", None)
+    for _ in range(50):
+        await asyncio.sleep(0.01)
+        if len(await ActivityLogRepository().list(session)) == 2:
+            break
+    assert len(await ActivityLogRepository().list(session)) == 2
+
+    await writer.stop()
+    for _ in range(4):
+        writer.emit("noop", None)
+    await writer.flush()
+    assert len(await ActivityLogRepository().list(session)) == 5
+
+
+@pytest.mark.asyncio
+async def test_expired_partitions_are_dropped(session: AsyncSession) -> None:
+    repo = ActivityLogRepository()
+    created = [
+        await repo.create_partition(session, month)
+        for month in (date(2024, 11, 15), date(2024, 12, 1), date(2025, 1, 1))
+    ]
+    assert created == [
+        "activity_logs_p2024_11",
+        "activity_logs_p2024_12",
+        "activity_logs_p2025_01",
+    ]
+    assert await repo.create_partition(session, date(2024, 12, 1)) is None
+
+    old = [
+        ActivityLogCreate(action="old", created_at=datetime(2024, 11, 20)),
+        ActivityLogCreate(action="kept", created_at=datetime(2025, 1, 3)),
+    ]
+    await repo.create_many(session, old)
+
+    dropped = await repo.drop_partitions_before(session, datetime(2025, 1, 1))
+    assert dropped == ["activity_logs_p2024_11", "activity_logs_p2024_12"]
+    assert [entry.action for entry in await repo.list(session)] == ["kept"]
+
+
+@pytest.mark.asyncio
+async def test_partition_maintenance_handles_each_month(
+    session: AsyncSession,
+) -> None:
+    class Repository(ActivityLogRepository):
+        async def create_partition(self, session, month):
+            if month == date(2025, 4, 1):
+                raise SQLAlchemyError("boom")
+            return await super().create_partition(session, month)
+
+    repo = ActivityLogRepository()
+    # Lands in the default partition: March has no partition yet.
+    await repo.create_many(
+        session, [ActivityLogCreate(action="early", created_at=datetime(2025, 3, 2))]
+    )
+
+    await maintain_activity_log_partitions(
+        now=datetime(2025, 3, 10),
+        session_factory=async_sessionmaker(session.bind, expire_on_commit=False),
+        repository=Repository(),
+    )
+
+    result = await session.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'tasks.activity_logs'::regclass ORDER BY 1"
+        )
+    )
+    assert list(result.scalars()) == [
+        "activity_logs_default",
+        "activity_logs_p2025_03",
+        "activity_logs_p2025_05",
+        "activity_logs_p2025_06",
+    ]
+    moved = await session.scalar(
+        text("SELECT action FROM tasks.activity_logs_p2025_03")
+    )
+    assert moved == "early"
+    assert [entry.action for entry in await repo.list(session)] == ["early"]
@@ -1,21 +1,31 @@
 from __future__ import annotations
 
+import csv
+import io
 import sys
 from pathlib import Path
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from app.core.database import get_read_session_factory  # noqa: E402
 from app.domain.schemas import (  # noqa: E402
+    BoardResponse,
     ErrorResponse,
+    ListCreate,
     ProjectCreate,
+    TaskBatchResponse,
+    TaskBatchUpdateResponse,
     TaskCreate,
     TaskListResponse,
+    TaskRead,
 )
+from app.main import app  # noqa: E402
 from app.repositories import ProjectRepository  # noqa: E402
+from app.services.lists import ListService  # noqa: E402
 from app.services.tasks import TaskService  # noqa: E402
 
 sys.path.pop(0)
@@ -42,6 +52,28 @@ async def test_list_tasks_pagination(client: tuple[AsyncClient, AsyncSession]) -
     body = TaskListResponse.model_validate(resp.json())
     assert body.pagination.total == 2
     assert len(body.tasks) == 1
+    assert body.next_cursor
+
+    resp = await ac.get(
+        f"/tasks/projects/{project.id}/tasks",
+        params={"limit": 1, "cursor": body.next_cursor},
+    )
+    assert resp.status_code == 200
+    page = TaskListResponse.model_validate(resp.json())
+    assert page.pagination.total is None
+    assert page.next_cursor is None
+    assert [t.id for t in page.tasks] != [t.id for t in body.tasks]
+
+
+@pytest.mark.asyncio()
+async def test_list_tasks_invalid_cursor(
+    client: tuple[AsyncClient, AsyncSession],
+) -> None:
+    ac, _ = client
+    resp = await ac.get("/tasks/projects/1/tasks", params={"cursor": "bogus"})
+    assert resp.status_code == 400
+    error = ErrorResponse.model_validate(resp.json()["detail"])
+    assert error.code == "INVALID_CURSOR"
 
 
 @pytest.mark.asyncio()
@@ -51,3 +83,212 @@ async def test_get_task_not_found(client: tuple[AsyncClient, AsyncSession]) -> N
     assert resp.status_code == 404
     error = ErrorResponse.model_validate(resp.json()["detail"])
     assert error.code == "TASK_NOT_FOUND"
+
+
+@pytest.mark.asyncio()
+async def test_create_tasks_batch(client: tuple[AsyncClient, AsyncSession]) -> None:
+    ac, session = client
+    project_repo = ProjectRepository()
+    project = await project_repo.create(session, ProjectCreate(name="p", slug="p"))
+    resp = await ac.post(
+        f"/tasks/projects/{project.id}/tasks:batch",
+        json={
+            "tasks": [
+                {"title": "a", "assignee_ids": [1], "sector_id": 2},
+                {"title": "b", "status": "completed"},
+                {"title": "c", "assignee_ids": [1, -5]},
+                {"title": "d"},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    body = TaskBatchResponse.model_validate(resp.json())
+    assert [(t.title, t.code) for t in body.tasks] == [("a", "P-1"), ("d", "P-2")]
+    assert [(e.index, e.code) for e in body.errors] == [
+        (1, "VALIDATION_ERROR"),
+        (2, "INVALID_ASSIGNEES"),
+    ]
+
+    resp = await ac.post("/tasks/projects/999/tasks:batch", json={"tasks": [{}]})
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio()
+async def test_batch_update_move_and_archive(
+    client: tuple[AsyncClient, AsyncSession],
+) -> None:
+    ac, session = client
+    project_repo = ProjectRepository()
+    project = await project_repo.create(session, ProjectCreate(name="p", slug="p"))
+    service = TaskService(user_client=DummyUserClient())
+    t1 = await service.create(session, TaskCreate(project_id=project.id, title="a"))
+    t2 = await service.create(session, TaskCreate(project_id=project.id, title="b"))
+
+    resp = await ac.patch(
+        "/tasks/tasks:batch",
+        json={"ids": [t1.id, t2.id, 999], "patch": {"priority": "high"}},
+    )
+    assert resp.status_code == 200
+    body = TaskBatchUpdateResponse.model_validate(resp.json())
+    assert {t.priority for t in body.tasks} == {"high"}
+    assert body.not_found == [999]
+
+    resp = await ac.patch(
+        "/tasks/tasks:batch",
+        json={
+            "items": [
+                {"id": t1.id, "patch": {"title": "a2", "tags": ["x"]}},
+                {"id": t2.id, "patch": {"title": "b2", "tags": []}},
+            ]
+        },
+    )
+    body = TaskBatchUpdateResponse.model_validate(resp.json())
+    assert sorted((t.title, tuple(t.tags)) for t in body.tasks) == [
+        ("a2", ("x",)),
+        ("b2", ()),
+    ]
+
+    resp = await ac.post("/tasks/tasks:archive", json={"ids": [t1.id, t2.id]})
+    body = TaskBatchUpdateResponse.model_validate(resp.json())
+    assert {t.status for t in body.tasks} == {"completed"}
+    assert all(t.completed_at for t in body.tasks)
+
+    resp = await ac.patch("/tasks/tasks:batch", json={"ids": [t1.id]})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio()
+async def test_conditional_get_returns_not_modified(
+    client: tuple[AsyncClient, AsyncSession],
+) -> None:
+    ac, session = client
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    service = TaskService(user_client=DummyUserClient())
+    task = await service.create(session, TaskCreate(project_id=project.id, title="t"))
+
+    urls = [
+        f"/tasks/tasks/{task.id}",
+        f"/tasks/projects/{project.id}/tasks",
+        f"/tasks/projects/{project.id}/lists",
+        f"/tasks/projects/{project.id}",
+    ]
+    etags = {}
+    for url in urls:
+        resp = await ac.get(url)
+        assert resp.status_code == 200
+        etags[url] = resp.headers["ETag"]
+        assert etags[url].startswith('W/"')
+
+        resp = await ac.get(url, headers={"If-None-Match": etags[url]})
+        assert resp.status_code == 304
+        assert resp.headers["ETag"] == etags[url]
+        assert resp.content == b""
+
+    resp = await ac.patch(f"/tasks/tasks/{task.id}", json={"title": "changed"})
+    assert resp.status_code == 200
+    for url in urls[:2]:
+        resp = await ac.get(url, headers={"If-None-Match": etags[url]})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] != etags[url]
+
+
+@pytest.mark.asyncio()
+async def test_board(client: tuple[AsyncClient, AsyncSession]) -> None:
+    ac, session = client
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    lists = ListService()
+    todo = await lists.create(
+        session, ListCreate(project_id=project.id, name="todo", position=1)
+    )
+    empty = await lists.create(
+        session, ListCreate(project_id=project.id, name="empty", position=2)
+    )
+    done = await lists.create(
+        session, ListCreate(project_id=project.id, name="done", position=0)
+    )
+    service = TaskService(user_client=DummyUserClient())
+    for i in range(3):
+        await service.create(
+            session,
+            TaskCreate(project_id=project.id, list_id=todo.id, title=f"todo {i}"),
+        )
+    await service.create(
+        session, TaskCreate(project_id=project.id, list_id=done.id, title="done")
+    )
+    await service.create(session, TaskCreate(project_id=project.id, title="loose"))
+
+    resp = await ac.get(f"/tasks/projects/{project.id}/board", params={"per_list": 2})
+    assert resp.status_code == 200
+    board = BoardResponse.model_validate(resp.json())
+    assert [lst.id for lst in board.lists] == [done.id, todo.id, empty.id]
+    assert [(len(lst.tasks), lst.total) for lst in board.lists] == [
+        (1, 1),
+        (2, 3),
+        (0, 0),
+    ]
+    assert [t.title for t in board.lists[1].tasks] == ["todo 0", "todo 1"]
+
+
+@pytest.mark.asyncio
+async def test_project_stats(client: tuple[AsyncClient, AsyncSession]) -> None:
+    ac, session = client
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    service = TaskService(user_client=DummyUserClient())
+    await service.create(session, TaskCreate(project_id=project.id, title="a"))
+
+    resp = await ac.get(f"/tasks/projects/{project.id}/stats")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 1
+    assert body["by_status"]["pending"] == 1
+
+    resp = await ac.get("/tasks/projects/999/stats")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_streams_filtered_tasks(
+    client: tuple[AsyncClient, AsyncSession],
+) -> None:
+    ac, session = client
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    service = TaskService(user_client=DummyUserClient())
+    for i in range(5):
+        await service.create(
+            session,
+            TaskCreate(
+                project_id=project.id,
+                title=f"t{i}",
+                tags=["x", "y"] if i % 2 else [],
+            ),
+        )
+    factory = async_sessionmaker(session.bind, expire_on_commit=False)
+    app.dependency_overrides[get_read_session_factory] = lambda: factory
+
+    resp = await ac.get(
+        f"/tasks/projects/{project.id}/tasks/export",
+        params={"tag": "x", "order_by": "title", "order": "desc"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = resp.text.splitlines()
+    assert [TaskRead.model_validate_json(line).title for line in lines] == [
+        "t3",
+        "t1",
+    ]
+
+    resp = await ac.get(
+        f"/tasks/projects/{project.id}/tasks/export", params={"format": "csv"}
+    )
+    assert resp.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [row["title"] for row in rows] == [f"t{i}" for i in range(5)]
+    assert rows[1]["tags"] == "x;y"
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.cache import MISSING, TTLCache  # noqa: E402
+
+sys.path.pop(0)
+
+
+def test_entries_expire_after_ttl() -> None:
+    now = 0.0
+    cache: TTLCache[str, int] = TTLCache("test", maxsize=10, ttl=5, timer=lambda: now)
+    cache.set("a", 1)
+    cache.set("b", None, ttl=1)  # type: ignore[arg-type]
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    now = 2.0
+    assert cache.get("b") is MISSING
+    now = 6.0
+    assert cache.get("a") is MISSING
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache: TTLCache[str, int] = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    cache.invalidate("a")
+    assert cache.get("a") is MISSING
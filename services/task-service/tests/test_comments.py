@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.domain.schemas import ProjectCreate, TaskCreate  # noqa: E402
+from app.repositories import ProjectRepository, TaskRepository  # noqa: E402
+from app.services.comments import CommentService, parse_mentions  # noqa: E402
+
+sys.path.pop(0)
+
+
+def test_parse_mentions_keeps_first_occurrence() -> None:
+    assert parse_mentions("@bob, see @alice_2 and @bob.") == ["bob", "alice_2"]
+    assert parse_mentions("no mentions, mail a@") == []
+
+
+@pytest.mark.asyncio()
+async def test_mentions_are_stored_and_searchable(
+    client: tuple[AsyncClient, AsyncSession],
+) -> None:
+    ac, session = client
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    task = await TaskRepository().create(
+        session, TaskCreate(project_id=project.id, title="t", code="P-1")
+    )
+
+    resp = await ac.post(
+        f"/tasks/tasks/{task.id}/comments", json={"content": "ping @bob and @carol"}
+    )
+    assert resp.status_code == 201
+    assert resp.json()["mentions"] == ["bob", "carol"]
+    first = resp.json()["id"]
+    resp = await ac.post(f"/tasks/tasks/{task.id}/comments", json={"content": "@bob"})
+    second = resp.json()["id"]
+
+    resp = await ac.get(f"/tasks/tasks/{task.id}/comments")
+    assert [c["mentions"] for c in resp.json()["comments"]] == [
+        ["bob", "carol"],
+        ["bob"],
+    ]
+
+    resp = await ac.get("/tasks/mentions/bob")
+    assert [c["id"] for c in resp.json()["comments"]] == [second, first]
+
+    await CommentService().update(session, first, {"content": "thanks @dave"})
+    resp = await ac.get("/tasks/mentions/carol")
+    assert resp.json()["comments"] == []
+    resp = await ac.get("/tasks/mentions/dave")
+    assert [c["id"] for c in resp.json()["comments"]] == [first]
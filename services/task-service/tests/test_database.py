@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core import database
+from app.core.middleware import ReadYourWritesMiddleware
+
+sys.path.pop(0)
+
+
+@pytest.fixture()
+def app(monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    def factory(name: str):
+        class Session:
+            async def __aenter__(self) -> str:
+                return name
+
+            async def __aexit__(self, *exc) -> None:
+                return None
+
+        return lambda: Session()
+
+    monkeypatch.setattr(database, "async_session_factory", factory("primary"))
+    monkeypatch.setattr(database, "read_session_factory", factory("replica"))
+
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, window=5)
+
+    @app.get("/items")
+    async def read(session: str = Depends(database.get_read_session)) -> dict:
+        return {"session": session}
+
+    @app.post("/items")
+    async def write(session: str = Depends(database.get_session)) -> dict:
+        return {"session": session}
+
+    return app
+
+
+def test_reads_use_replica_until_client_writes(app: FastAPI) -> None:
+    client = TestClient(app)
+    assert client.get("/items").json() == {"session": "replica"}
+
+    resp = client.post("/items")
+    assert resp.json() == {"session": "primary"}
+    until = float(resp.cookies[database.READ_YOUR_WRITES_COOKIE])
+    assert time.time() < until <= time.time() + 5
+
+    assert client.get("/items").json() == {"session": "primary"}
+
+
+def test_expired_write_marker_reads_from_replica(app: FastAPI) -> None:
+    client = TestClient(app)
+    client.cookies.set(database.READ_YOUR_WRITES_COOKIE, str(time.time() - 1))
+    assert client.get("/items").json() == {"session": "replica"}
+    client.cookies.set(database.READ_YOUR_WRITES_COOKIE, "garbage")
+    assert client.get("/items").json() == {"session": "replica"}
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.api.tasks import get_task_importer  # noqa: E402
+from app.domain.schemas import ListCreate, ProjectCreate  # noqa: E402
+from app.main import app  # noqa: E402
+from app.repositories import ListRepository, ProjectRepository  # noqa: E402
+from app.services import TaskImporter, TaskService  # noqa: E402
+
+sys.path.pop(0)
+
+
+class DummyUserClient:
+    async def missing_users(self, user_ids):  # pragma: no cover - simple stub
+        return {uid for uid in user_ids if uid < 0}
+
+    async def sector_names(self, sector_ids):  # pragma: no cover - simple stub
+        return {sid: "Sector" for sid in sector_ids if sid > 0}
+
+
+@pytest.fixture()
+def importer() -> TaskImporter:
+    importer = TaskImporter(user_client=DummyUserClient(), batch_size=2)
+    app.dependency_overrides[get_task_importer] = lambda: importer
+    return importer
+
+
+@pytest.mark.asyncio()
+async def test_import_csv_reports_rejected_rows(
+    client: tuple[AsyncClient, AsyncSession], importer: TaskImporter
+) -> None:
+    ac, session = client
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    lst = await ListRepository().create(
+        session, ListCreate(project_id=project.id, name="todo", position=0)
+    )
+    body = (
+        "title,status,list_id,assignee_ids,tags,sector_id,ignored\n"
+        f'"multi\nline",pending,{lst.id},1;2,a;b,,x\n'
+        "bad status,unknown,,,,,\n"
+        "ghost assignee,pending,,-1,,,\n"
+        "bad list,pending,999,,,,\n"
+        "bad sector,pending,,,,-5,\n"
+        "plain,,,,,3,\n"
+    )
+    resp = await ac.post(
+        f"/tasks/projects/{project.id}/tasks:import",
+        params={"format": "csv"},
+        content=body.encode(),
+    )
+    assert resp.status_code == 200
+    report = resp.json()
+    assert report["imported"] == 2
+    assert report["failed"] == 4
+    assert [(e["index"], e["code"]) for e in report["errors"]] == [
+        (1, "VALIDATION_ERROR"),
+        (2, "INVALID_ASSIGNEES"),
+        (3, "INVALID_LIST"),
+        (4, "INVALID_SECTOR"),
+    ]
+
+    tasks, total, _ = await TaskService().list(session, project_id=project.id)
+    assert total == 2
+    first, second = tasks
+    assert (first.title, first.code, first.list_id) == ("multi\nline", "P-1", lst.id)
+    assert first.assignee_ids == [1, 2] and first.tags == ["a", "b"]
+    assert (second.title, second.code, second.sector_id) == ("plain", "P-2", 3)
+
+
+@pytest.mark.asyncio()
+async def test_import_ndjson_and_unknown_project(
+    client: tuple[AsyncClient, AsyncSession], importer: TaskImporter
+) -> None:
+    ac, session = client
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    body = b'{"title": "a", "code": "X-9", "id": 5}\n\n[1]\n{"title": "b"}\n'
+    resp = await ac.post(f"/tasks/projects/{project.id}/tasks:import", content=body)
+    report = resp.json()
+    assert (report["imported"], report["failed"]) == (2, 1)
+    assert report["errors"][0]["index"] == 1
+
+    stats = await ac.get(f"/tasks/projects/{project.id}/stats")
+    assert stats.json()["total"] == 2
+
+    resp = await ac.post("/tasks/projects/999/tasks:import", content=body)
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio()
+async def test_import_unreadable_file(
+    client: tuple[AsyncClient, AsyncSession], importer: TaskImporter
+) -> None:
+    ac, session = client
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    body = (
+        b"".join(b'{"title": "t%d"}\n' % i for i in range(5)) + b'{"title": "\xff"}\n'
+    )
+    resp = await ac.post(f"/tasks/projects/{project.id}/tasks:import", content=body)
+    assert resp.status_code == 422
+    assert resp.json()["detail"]["code"] == "INVALID_ENCODING"
+    _, total, _ = await TaskService().list(session, project_id=project.id)
+    assert total == 0
+
+    # Without the upfront check, the rows read before the failure are kept.
+    def rows():
+        yield from body.decode("latin-1").splitlines()[:4]
+        raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+    report = await importer.run(session, project.id, rows())
+    assert (report.imported, report.failed) == (4, 1)
+    assert [(e.index, e.code) for e in report.errors] == [(4, "INVALID_FILE")]
+    stats = await ac.get(f"/tasks/projects/{project.id}/stats")
+    assert stats.json()["total"] == 4
+
+
+class FailingUserClient(DummyUserClient):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def missing_users(self, user_ids):
+        self.calls += 1
+        if self.calls > 1:
+            raise HTTPException(status_code=422, detail="User service request failed")
+        return set()
+
+
+@pytest.mark.asyncio()
+async def test_import_stops_when_user_service_fails(session: AsyncSession) -> None:
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    importer = TaskImporter(user_client=FailingUserClient(), batch_size=2)
+    rows = ['{"title": "t%d"}' % i for i in range(6)]
+
+    report = await importer.run(session, project.id, rows)
+    assert (report.processed, report.imported, report.failed) == (4, 2, 2)
+    assert [(e.index, e.code) for e in report.errors] == [
+        (2, "USER_SERVICE_ERROR"),
+        (3, "USER_SERVICE_ERROR"),
+    ]
+    _, total, _ = await TaskService().list(session, project_id=project.id)
+    assert total == 2
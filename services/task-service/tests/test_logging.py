@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.logging import (
+    ContextFilter,
+    JsonFormatter,
+    SamplingFilter,
+    parse_sampling,
+    request_id_ctx_var,
+)
+
+sys.path.pop(0)
+
+
+def _record(name: str, level: int = logging.INFO, **extra) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, "hello %s", ("x",), None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_context_is_captured_before_formatting() -> None:
+    record = _record("app")
+    token = request_id_ctx_var.set("req-1")
+    try:
+        ContextFilter().filter(record)
+    finally:
+        request_id_ctx_var.reset(token)
+
+    data = json.loads(JsonFormatter().format(record))
+    assert data["message"] == "hello x"
+    assert data["request_id"] == "req-1"
+
+
+def test_parse_sampling() -> None:
+    assert parse_sampling("uvicorn.access=0.1, app = 0.5,,bad") == {
+        "uvicorn.access": 0.1,
+        "app": 0.5,
+    }
+
+
+def test_sampling_filter() -> None:
+    sampler = SamplingFilter({"uvicorn": 0.0, "app.requests": 0.5})
+    assert not sampler.filter(_record("uvicorn.access"))
+    assert sampler.filter(_record("uvicorn.access", logging.WARNING))
+    assert sampler.filter(_record("other"))
+
+    kept = [
+        sampler.filter(_record("app.requests", request_id=f"req-{i}"))
+        for i in range(1000)
+    ]
+    assert 350 < sum(kept) < 650
+    # The decision is stable for all records of the same request.
+    assert {
+        sampler.filter(_record("app.requests", request_id="req-7")) for _ in range(5)
+    } == {kept[7]}
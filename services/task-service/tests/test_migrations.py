@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app.domain.models import ProjectTaskCounter, Task  # noqa: E402
+from app.domain.schemas import ProjectCreate, TaskCreate  # noqa: E402
+from app.repositories import ProjectRepository  # noqa: E402
+from app.services.tasks import TaskService  # noqa: E402
+
+sys.path.pop(0)
+
+
+class DummyUserClient:
+    async def verify_users(self, user_ids) -> None:  # pragma: no cover - simple stub
+        return None
+
+
+VERSIONS = Path(__file__).resolve().parents[1] / "alembic" / "versions"
+
+
+def load_migration(name: str):
+    spec = importlib.util.spec_from_file_location(name, VERSIONS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.asyncio
+async def test_task_counters_continue_after_highest_code(
+    session: AsyncSession,
+) -> None:
+    service = TaskService(user_client=DummyUserClient())
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    first, second, _ = [
+        await service.create(session, TaskCreate(project_id=project.id, title=title))
+        for title in ("a", "b", "c")
+    ]
+    # Two tasks are left, but P-3 is taken.
+    await service.delete(session, first.id)
+    await session.execute(
+        update(Task).where(Task.id == second.id).values(code="P-legacy")
+    )
+
+    migration = load_migration("0003_project_task_counters")
+
+    def upgrade(connection) -> None:
+        ProjectTaskCounter.__table__.drop(connection)
+        with Operations.context(MigrationContext.configure(connection)):
+            migration.upgrade()
+
+    connection = await session.connection()
+    await connection.run_sync(upgrade)
+    await session.commit()
+
+    counter = await session.scalar(
+        select(ProjectTaskCounter.last_value).where(
+            ProjectTaskCounter.project_id == project.id
+        )
+    )
+    assert counter == 3
+    task = await service.create(session, TaskCreate(project_id=project.id, title="d"))
+    assert task.code == "P-4"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import sys
 from pathlib import Path
 
@@ -14,6 +15,13 @@ from fastapi.testclient import TestClient
 sys.path.pop(0)
 
 
+@pytest.fixture(autouse=True)
+def clear_role_cache():
+    permissions.ROLE_CACHE.clear()
+    yield
+    permissions.ROLE_CACHE.clear()
+
+
 @pytest.fixture()
 def app(monkeypatch) -> FastAPI:
     async def mock_user() -> dict[str, int | dict]:  # type: ignore[override]
@@ -112,3 +120,76 @@ def test_non_member_forbidden(app: FastAPI, monkeypatch) -> None:
     client = TestClient(app)
     resp = client.get("/projects/1/tasks")
     assert resp.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_role_lookups_are_cached_and_coalesced(monkeypatch) -> None:
+    calls = 0
+
+    async def mock_fetch(
+        project_id: int, user_id: str, base_url: str | None = None
+    ) -> str | None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "Contributor"
+
+    monkeypatch.setattr(permissions, "_fetch_project_role", mock_fetch)
+
+    roles = await asyncio.gather(
+        *(permissions.get_project_role(1, "1") for _ in range(5))
+    )
+    assert roles == ["Contributor"] * 5
+    assert await permissions.get_project_role(1, 1) == "Contributor"
+    assert calls == 1
+
+    permissions.invalidate_project_role(1, 1)
+    await permissions.get_project_role(1, "1")
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_non_member_is_cached(monkeypatch) -> None:
+    calls = 0
+
+    async def mock_fetch(
+        project_id: int, user_id: str, base_url: str | None = None
+    ) -> str | None:
+        nonlocal calls
+        calls += 1
+        return None
+
+    monkeypatch.setattr(permissions, "_fetch_project_role", mock_fetch)
+
+    assert await permissions.get_project_role(2, "1") is None
+    assert await permissions.get_project_role(2, "1") is None
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_lookup_is_not_overwritten(monkeypatch) -> None:
+    roles = iter(["Owner", "Viewer"])
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def mock_fetch(
+        project_id: int, user_id: str, base_url: str | None = None
+    ) -> str | None:
+        role = next(roles)
+        if role == "Owner":
+            started.set()
+            await release.wait()
+        return role
+
+    monkeypatch.setattr(permissions, "_fetch_project_role", mock_fetch)
+
+    stale = asyncio.ensure_future(permissions.get_project_role(3, "1"))
+    await started.wait()
+    permissions.invalidate_project_role(3, "1")
+    # A lookup after the change does not join the one that started before it.
+    fresh = permissions.get_project_role(3, "1")
+    assert await asyncio.wait_for(fresh, timeout=1) == "Viewer"
+    release.set()
+    assert await stale == "Owner"
+    assert permissions.ROLE_CACHE.get((3, "1")) == "Viewer"
+    assert not permissions._role_generations
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import sys
-import types
+import time
 from pathlib import Path
 
 import httpx
@@ -13,15 +14,28 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from app.core import security
 from cryptography.hazmat.primitives.asymmetric import rsa
+from fastapi import HTTPException
 from fastapi.security import HTTPAuthorizationCredentials
 from jwt.utils import base64url_encode
 
 sys.path.pop(0)
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    security.jwks.clear()
+    security.clear_token_caches()
+    yield
+    security.clear_token_caches()
+
+
+@pytest.fixture()
+def private_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
 @pytest.fixture()
-def token_and_jwk() -> tuple[str, dict[str, str]]:
-    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+def token_and_jwk(private_key) -> tuple[str, dict[str, str]]:
     public_key = private_key.public_key()
     numbers = public_key.public_numbers()
     n = base64url_encode(
@@ -59,7 +73,7 @@ def test_validate_token_uses_cache(monkeypatch, token_and_jwk) -> None:
         return Resp()
 
     monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
-    security._jwks_cache.clear()
+    security.jwks.clear()
     asyncio.run(security.validate_token(token))
     asyncio.run(security.validate_token(token))
     assert calls["count"] == 1
@@ -82,13 +96,20 @@ def test_jwk_cache_expires(monkeypatch, token_and_jwk) -> None:
         return Resp()
 
     monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
-    security._jwks_cache.clear()
-    monkeypatch.setattr(security, "JWKS_CACHE_TTL_SECONDS", 10)
     current_time = 0.0
     monkeypatch.setattr(
-        security, "time", types.SimpleNamespace(time=lambda: current_time)
+        security,
+        "jwks",
+        security.JWKSManager(
+            "http://auth/jwks.json",
+            ttl=10,
+            refresh_ahead=0,
+            min_refetch_interval=1,
+            timer=lambda: current_time,
+        ),
     )
     asyncio.run(security.validate_token(token))
+    security.clear_token_caches()
     current_time = 20.0
     asyncio.run(security.validate_token(token))
     assert calls["count"] == 2
@@ -108,8 +129,151 @@ def test_get_current_user(monkeypatch, token_and_jwk) -> None:
         return Resp()
 
     monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
-    security._jwks_cache.clear()
+    security.jwks.clear()
     creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
     user = asyncio.run(security.get_current_user(creds))
     assert user["user_id"] == "123"
     assert user["sector_id"] == 5
+
+
+class JWKSResponse:
+    def __init__(self, jwk: dict[str, str] | None = None, error: bool = False):
+        self.jwk = jwk
+        self.error = error
+
+    def raise_for_status(self) -> None:
+        if self.error:
+            request = httpx.Request("GET", "http://auth/jwks.json")
+            raise httpx.HTTPStatusError(
+                "unavailable",
+                request=request,
+                response=httpx.Response(503, request=request),
+            )
+
+    def json(self) -> dict[str, list[dict[str, str]]]:
+        return {"keys": [self.jwk] if self.jwk else []}
+
+
+def _manager(monkeypatch, clock: list[float], responses: list) -> tuple:
+    calls = {"count": 0}
+
+    async def mock_get(self, url):  # type: ignore[override]
+        calls["count"] += 1
+        await asyncio.sleep(0)
+        return responses[min(calls["count"], len(responses)) - 1]
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
+    manager = security.JWKSManager(
+        "http://auth/jwks.json",
+        ttl=100,
+        refresh_ahead=10,
+        min_refetch_interval=30,
+        max_stale=50,
+        timer=lambda: clock[0],
+    )
+    return manager, calls
+
+
+def test_jwks_concurrent_fetches_are_collapsed(monkeypatch, token_and_jwk) -> None:
+    _, jwk = token_and_jwk
+    manager, calls = _manager(monkeypatch, [0.0], [JWKSResponse(jwk)])
+
+    async def run() -> list[dict[str, str]]:
+        return await asyncio.gather(*(manager.get("test") for _ in range(10)))
+
+    assert asyncio.run(run()) == [jwk] * 10
+    assert calls["count"] == 1
+
+
+def test_jwks_unknown_kid_refetch_is_rate_limited(monkeypatch, token_and_jwk) -> None:
+    _, jwk = token_and_jwk
+    clock = [0.0]
+    manager, calls = _manager(monkeypatch, clock, [JWKSResponse(jwk)])
+
+    async def lookup(kid: str) -> int:
+        try:
+            await manager.get(kid)
+        except HTTPException as exc:
+            return exc.status_code
+        return 200
+
+    assert asyncio.run(lookup("test")) == 200
+    assert asyncio.run(lookup("other")) == 401
+    assert asyncio.run(lookup("other")) == 401
+    assert calls["count"] == 1
+    clock[0] = 31.0
+    assert asyncio.run(lookup("other")) == 401
+    assert calls["count"] == 2
+
+
+def test_jwks_refreshes_in_background_and_serves_stale(
+    monkeypatch, token_and_jwk
+) -> None:
+    _, jwk = token_and_jwk
+    clock = [0.0]
+    manager, calls = _manager(
+        monkeypatch, clock, [JWKSResponse(jwk), JWKSResponse(error=True)]
+    )
+
+    async def run() -> dict[str, str]:
+        result = await manager.get("test")
+        await asyncio.sleep(0.01)
+        return result
+
+    asyncio.run(run())
+    clock[0] = 95.0
+    assert asyncio.run(run()) == jwk
+    assert calls["count"] == 2
+
+    clock[0] = 140.0
+    assert asyncio.run(run()) == jwk
+    assert calls["count"] == 3
+
+    clock[0] = 160.0
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(run())
+    assert exc_info.value.status_code == 503
+
+
+def _mock_jwks(monkeypatch, jwk: dict[str, str]) -> None:
+    async def mock_get(self, url):  # type: ignore[override]
+        return JWKSResponse(jwk)
+
+    monkeypatch.setattr(httpx.AsyncClient, "get", mock_get)
+
+
+def test_verified_claims_are_cached(monkeypatch, token_and_jwk) -> None:
+    token, jwk = token_and_jwk
+    _mock_jwks(monkeypatch, jwk)
+    decode = jwt.decode
+    calls = {"count": 0}
+
+    def counting_decode(*args, **kwargs):
+        calls["count"] += 1
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    first = asyncio.run(security.validate_token(token))
+    second = asyncio.run(security.validate_token(token))
+    assert first == second == {"sub": "123", "sector_id": 5}
+    assert calls["count"] == 1
+
+
+def test_claims_cache_honors_exp(monkeypatch, private_key, token_and_jwk) -> None:
+    _, jwk = token_and_jwk
+    _mock_jwks(monkeypatch, jwk)
+    clock = [0.0]
+    cache = security.TTLCache(
+        "verified_tokens", maxsize=10, ttl=60, timer=lambda: clock[0]
+    )
+    monkeypatch.setattr(security, "_verified_tokens", cache)
+    token = jwt.encode(
+        {"sub": "123", "sector_id": 5, "exp": int(time.time()) + 30},
+        private_key,
+        algorithm="RS256",
+        headers={"kid": "test"},
+    )
+    asyncio.run(security.validate_token(token))
+    assert len(cache) == 1
+    clock[0] = 30.0
+    assert cache.get(hashlib.sha256(token.encode()).digest()) is security.MISSING
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import asyncio
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 from pydantic import ValidationError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app.core.pagination import InvalidCursorError
 from app.domain.models import Task
-from app.domain.schemas import ProjectCreate, Status, TaskCreate
-from app.repositories import ProjectRepository
+from app.domain.schemas import ProjectCreate, Status, TaskCreate, TaskRead
+from app.repositories import ProjectRepository, TaskRepository
+from app.repositories.stats import ProjectStatsRepository, StatsDelta, tracked_values
+from app.services.projects import ProjectService, reconcile_project_stats
 from app.services.tasks import TaskService
 sys.path.pop(0)
 
@@ -106,6 +110,32 @@ def test_calculate_timeliness_overdue() -> None:
     assert metrics["days_remaining"] <= -1
 
 
+def test_to_read_model_matches_validated_model() -> None:
+    now = datetime.utcnow().replace(microsecond=0)
+    task = Task(
+        id=1,
+        project_id=1,
+        title="t",
+        code="X",
+        status="completed",
+        priority="high",
+        start_date=now - timedelta(days=2),
+        due_date=now - timedelta(days=1),
+        completed_at=now,
+        assignee_ids=[3],
+        tags=["a"],
+        created_at=now,
+        updated_at=now,
+    )
+    service = TaskService()
+    read = service._to_read_model(task, now)
+    validated = TaskRead.model_validate(task).model_copy(
+        update=service._calculate_timeliness(task, now)
+    )
+    assert read == validated
+    assert read.model_dump_json() == validated.model_dump_json()
+
+
 @pytest.mark.asyncio
 async def test_update_assignees_idempotent(session: AsyncSession) -> None:
     service = TaskService(user_client=DummyUserClient())
@@ -131,3 +161,278 @@ async def test_generate_code(session: AsyncSession) -> None:
     t2 = await service.create(session, TaskCreate(project_id=project.id, title="b"))
     assert t1.code == "ABC-1"
     assert t2.code == "ABC-2"
+
+
+@pytest.mark.asyncio
+async def test_generate_code_concurrent_creates(session: AsyncSession) -> None:
+    project_repo = ProjectRepository()
+    project = await project_repo.create(session, ProjectCreate(name="Proj", slug="abc"))
+    factory = async_sessionmaker(session.bind, expire_on_commit=False)
+
+    async def create(title: str) -> str:
+        service = TaskService(user_client=DummyUserClient())
+        async with factory() as other:
+            task = await service.create(
+                other, TaskCreate(project_id=project.id, title=title)
+            )
+        return task.code
+
+    codes = await asyncio.gather(*(create(f"t{i}") for i in range(10)))
+    assert sorted(codes) == sorted(f"ABC-{i}" for i in range(1, 11))
+
+
+@pytest.mark.asyncio
+async def test_list_timeliness_filter_order_and_total(session: AsyncSession) -> None:
+    service = TaskService(user_client=DummyUserClient())
+    project_repo = ProjectRepository()
+    project = await project_repo.create(session, ProjectCreate(name="p", slug="p"))
+    now = datetime.utcnow()
+    await service.create(
+        session,
+        TaskCreate(
+            project_id=project.id, title="overdue", due_date=now - timedelta(days=1)
+        ),
+    )
+    await service.create(
+        session,
+        TaskCreate(
+            project_id=project.id,
+            title="late",
+            due_date=now - timedelta(days=2),
+            status=Status.COMPLETED,
+            completed_at=now - timedelta(days=1),
+        ),
+    )
+    await service.create(
+        session,
+        TaskCreate(
+            project_id=project.id,
+            title="on_time",
+            due_date=now + timedelta(days=1),
+            status=Status.COMPLETED,
+            completed_at=now,
+        ),
+    )
+    await service.create(session, TaskCreate(project_id=project.id, title="none"))
+
+    data, total, _ = await service.list(
+        session, project_id=project.id, timeliness="overdue"
+    )
+    assert total == 1
+    assert [t.title for t in data] == ["overdue"]
+
+    data, total, _ = await service.list(
+        session, project_id=project.id, order_by="timeliness", offset=1, limit=2
+    )
+    assert total == 4
+    assert [t.title for t in data] == ["late", "overdue"]
+
+    data, total, _ = await service.list(
+        session, project_id=project.id, order_by="timeliness", order="desc", limit=1
+    )
+    assert [t.title for t in data] == ["none"]
+
+    data, total, _ = await service.list(session, project_id=project.id, offset=10)
+    assert data == []
+    assert total == 4
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "order_by,order",
+    [
+        (None, "asc"),
+        ("due_date", "asc"),
+        ("due_date", "desc"),
+        ("timeliness", "desc"),
+        ("tags", "asc"),
+        ("tags", "desc"),
+        ("assignee_ids", "asc"),
+        ("assignee_ids", "desc"),
+    ],
+)
+async def test_list_cursor_pagination(
+    session: AsyncSession, order_by: str | None, order: str
+) -> None:
+    service = TaskService(user_client=DummyUserClient())
+    project_repo = ProjectRepository()
+    project = await project_repo.create(session, ProjectCreate(name="p", slug="p"))
+    now = datetime.utcnow()
+    for i in range(7):
+        due = now + timedelta(days=i % 3 - 1) if i % 4 else None
+        await service.create(
+            session,
+            TaskCreate(
+                project_id=project.id,
+                title=f"t{i}",
+                due_date=due,
+                tags=[f"x{i % 3}"],
+                assignee_ids=[i % 2] if i % 3 else [],
+            ),
+        )
+
+    expected, total, _ = await service.list(
+        session, project_id=project.id, order_by=order_by, order=order
+    )
+    assert total == 7
+
+    seen: list[int] = []
+    data, _, cursor = await service.list(
+        session, project_id=project.id, order_by=order_by, order=order, limit=2
+    )
+    seen.extend(t.id for t in data)
+    while cursor:
+        data, total, cursor = await service.list(
+            session,
+            project_id=project.id,
+            order_by=order_by,
+            order=order,
+            limit=2,
+            cursor=cursor,
+        )
+        assert total is None
+        seen.extend(t.id for t in data)
+    assert seen == [t.id for t in expected]
+
+
+@pytest.mark.asyncio
+async def test_list_cursor_must_match_order(session: AsyncSession) -> None:
+    service = TaskService(user_client=DummyUserClient())
+    project_repo = ProjectRepository()
+    project = await project_repo.create(session, ProjectCreate(name="p", slug="p"))
+    for title in ("a", "b"):
+        await service.create(session, TaskCreate(project_id=project.id, title=title))
+    _, _, cursor = await service.list(session, project_id=project.id, limit=1)
+    assert cursor
+    with pytest.raises(InvalidCursorError):
+        await service.list(
+            session, project_id=project.id, order_by="title", cursor=cursor
+        )
+    with pytest.raises(InvalidCursorError):
+        await service.list(session, project_id=project.id, cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_list_fulltext_search_ranks_title_over_description(
+    session: AsyncSession,
+) -> None:
+    service = TaskService(user_client=DummyUserClient())
+    project_repo = ProjectRepository()
+    project = await project_repo.create(session, ProjectCreate(name="p", slug="p"))
+    await service.create(
+        session,
+        TaskCreate(
+            project_id=project.id, title="Write copy", description="budget review"
+        ),
+    )
+    await service.create(
+        session, TaskCreate(project_id=project.id, title="Budget review")
+    )
+    await service.create(session, TaskCreate(project_id=project.id, title="Other"))
+
+    data, total, _ = await service.list(session, project_id=project.id, search="budget")
+    assert total == 2
+    assert [t.title for t in data] == ["Budget review", "Write copy"]
+
+    first, _, cursor = await service.list(
+        session, project_id=project.id, search="budget", limit=1
+    )
+    second, _, cursor = await service.list(
+        session, project_id=project.id, search="budget", limit=1, cursor=cursor
+    )
+    assert [t.title for t in first + second] == ["Budget review", "Write copy"]
+    assert cursor is None
+
+
+@pytest.mark.asyncio
+async def test_project_stats_follow_task_writes(session: AsyncSession) -> None:
+    service = TaskService(user_client=DummyUserClient())
+    projects = ProjectService()
+    project = await projects.create(session, ProjectCreate(name="p", slug="p"))
+    stats = await projects.stats_summary(session, project.id)
+    assert stats and stats.total == 0
+    assert stats.by_status == {"pending": 0, "in_progress": 0, "completed": 0}
+
+    now = datetime.utcnow()
+    late = await service.create(
+        session,
+        TaskCreate(project_id=project.id, title="a", due_date=now - timedelta(days=1)),
+    )
+    other = await service.create(
+        session, TaskCreate(project_id=project.id, title="b", priority="high")
+    )
+    stats = await projects.stats_summary(session, project.id)
+    assert stats.total == 2
+    assert stats.by_priority["high"] == 1
+    assert stats.by_status["pending"] == 2
+    assert stats.overdue == 1
+
+    await service.archive(session, late.id)
+    await TaskRepository().update_many(
+        session, [other.id], {"priority": "low", "due_date": now - timedelta(hours=1)}
+    )
+    stats = await projects.stats_summary(session, project.id)
+    assert stats.by_status == {"pending": 1, "in_progress": 0, "completed": 1}
+    assert stats.by_priority["high"] == 0
+    assert stats.by_priority["low"] == 1
+    assert stats.completed_this_week == 1
+    assert stats.overdue == 1
+
+    await service.delete(session, other.id)
+    stats = await projects.stats_summary(session, project.id)
+    assert stats.total == 1
+    assert stats.by_priority["low"] == 0
+    assert stats.overdue == 0
+
+    # The reconciler agrees with the counters kept by the writes.
+    await projects.reconcile_stats(session)
+    stats = await projects.stats_summary(session, project.id)
+    assert (stats.total, stats.completed_this_week) == (1, 1)
+    assert stats.overdue == 0
+
+
+@pytest.mark.asyncio
+async def test_reconcile_keeps_concurrent_stats_deltas(session: AsyncSession) -> None:
+    factory = async_sessionmaker(session.bind, expire_on_commit=False)
+    projects = ProjectService()
+    project = await projects.create(session, ProjectCreate(name="p", slug="p"))
+
+    async with factory() as writer:
+        task = Task(project_id=project.id, title="a", code="P-1", status="pending")
+        writer.add(task)
+        await writer.flush()
+        delta = StatsDelta()
+        delta.add(tracked_values(task))
+        await ProjectStatsRepository().apply(writer, delta)
+        # The reconciler starts while the write is still uncommitted.
+        reconcile = asyncio.ensure_future(
+            reconcile_project_stats(session_factory=factory)
+        )
+        await asyncio.sleep(0.2)
+        await writer.commit()
+    await asyncio.wait_for(reconcile, timeout=5)
+
+    stats = await projects.stats_summary(session, project.id)
+    assert stats.total == 1
+    assert stats.by_status["pending"] == 1
+
+
+@pytest.mark.asyncio
+async def test_export_yields_fixed_size_chunks(session: AsyncSession) -> None:
+    service = TaskService(user_client=DummyUserClient())
+    project = await ProjectRepository().create(
+        session, ProjectCreate(name="p", slug="p")
+    )
+    for i in range(5):
+        await service.create(session, TaskCreate(project_id=project.id, title=f"t{i}"))
+
+    chunks = [
+        chunk
+        async for chunk in service.export(session, project_id=project.id, chunk_size=2)
+    ]
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+    titles = [
+        TaskRead.model_validate_json(line).title
+        for line in b"".join(chunks).splitlines()
+    ]
+    assert titles == [f"t{i}" for i in range(5)]
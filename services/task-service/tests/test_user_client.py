@@ -4,12 +4,20 @@ import httpx
 import pytest
 from fastapi import HTTPException
 
+from app.services import user_client
 from app.services.user_client import UserServiceClient
 
 pytestmark = pytest.mark.asyncio
 
 
-async def test_get_sector_name_success(monkeypatch):
+@pytest.fixture(autouse=True)
+def clear_caches():
+    user_client.clear_caches()
+    yield
+    user_client.clear_caches()
+
+
+async def test_get_sector_name_success():
     calls = 0
 
     def handler(request: httpx.Request) -> httpx.Response:
@@ -17,16 +25,8 @@ async def test_get_sector_name_success(monkeypatch):
         calls += 1
         return httpx.Response(200, json={"id": 1, "name": "Sector"})
 
-    transport = httpx.MockTransport(handler)
-    original_async_client = httpx.AsyncClient
-
-    def client_factory(*args, **kwargs):
-        kwargs["transport"] = transport
-        return original_async_client(*args, **kwargs)
-
-    monkeypatch.setattr(httpx, "AsyncClient", client_factory)
-
-    client = UserServiceClient(base_url="http://test")
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = UserServiceClient(base_url="http://test", http_client=http_client)
     name1 = await client.get_sector_name(1)
     name2 = await client.get_sector_name(1)
     assert name1 == "Sector"
@@ -34,19 +34,47 @@ async def test_get_sector_name_success(monkeypatch):
     assert calls == 1
 
 
-async def test_get_sector_name_not_found(monkeypatch):
+async def test_get_sector_name_not_found():
     def handler(request: httpx.Request) -> httpx.Response:
         return httpx.Response(404)
 
-    transport = httpx.MockTransport(handler)
-    original_async_client = httpx.AsyncClient
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = UserServiceClient(base_url="http://test", http_client=http_client)
+    with pytest.raises(HTTPException):
+        await client.get_sector_name(1)
 
-    def client_factory(*args, **kwargs):
-        kwargs["transport"] = transport
-        return original_async_client(*args, **kwargs)
 
-    monkeypatch.setattr(httpx, "AsyncClient", client_factory)
+async def test_batched_lookups_use_one_request_each():
+    paths: list[str] = []
 
-    client = UserServiceClient(base_url="http://test")
-    with pytest.raises(HTTPException):
-        await client.get_sector_name(1)
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path == "/users":
+            return httpx.Response(200, json={"users": [{"id": 1}, {"id": 2}]})
+        return httpx.Response(200, json=[{"id": 7, "name": "Ops"}])
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = UserServiceClient(base_url="http://test", http_client=http_client)
+    assert await client.missing_users([1, 2, 3, 2]) == {3}
+    assert await client.sector_names([7, 8]) == {7: "Ops"}
+    assert paths == ["/users", "/sectors"]
+
+
+async def test_lookups_are_shared_and_negatively_cached():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"users": [{"id": 1}]})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    first = UserServiceClient(base_url="http://test", http_client=http_client)
+    second = UserServiceClient(base_url="http://test", http_client=http_client)
+    assert await first.missing_users([1, 2]) == {2}
+    assert await second.missing_users([1, 2]) == {2}
+    assert calls == 1
+
+    user_client.invalidate_user(2)
+    assert await second.missing_users([1, 2]) == {2}
+    assert calls == 2
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from collections.abc import AsyncGenerator
+from typing import Any
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
+from servicekit.db_pool import DB_POOL, TimedQueuePool
 from sqlalchemy import MetaData, create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
@@ -18,6 +20,29 @@ class Base(DeclarativeBase):
     metadata = metadata
 
 
+def engine_options(url: str) -> dict[str, Any]:
+    """Pool and driver options from the settings, for server databases.
+
+    Set ``DB_STATEMENT_CACHE_SIZE=0`` behind PgBouncer in transaction mode.
+    """
+    if url.startswith("sqlite"):
+        return {}
+    options: dict[str, Any] = {
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "statement_cache_size": settings.db_statement_cache_size,
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+    return options
+
+
 settings = get_settings()
 
 database_url = str(settings.database_url)
@@ -47,7 +72,10 @@ if database_url.startswith("sqlite://") and not database_url.startswith(
 if database_url.startswith("sqlite+aiosqlite://"):
     metadata.schema = None
 
-async_engine = create_async_engine(database_url, connect_args=connect_args)
+options = engine_options(database_url)
+options["connect_args"] = {**options.get("connect_args", {}), **connect_args}
+async_engine = create_async_engine(database_url, **options)
+DB_POOL.add("primary", async_engine.pool)
 async_session_factory = async_sessionmaker(
     async_engine, expire_on_commit=False, class_=AsyncSession
 )
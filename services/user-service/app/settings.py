@@ -11,12 +11,19 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     jwt_secret_key: str = Field("secret", alias="JWT_SECRET_KEY")
     jwt_algorithm: str = Field("HS256", alias="JWT_ALGORITHM")
+    db_pool_size: int = Field(5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30.0, alias="DB_POOL_TIMEOUT")
+    db_pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")
+    db_pool_pre_ping: bool = Field(False, alias="DB_POOL_PRE_PING")
+    db_statement_cache_size: int = Field(100, alias="DB_STATEMENT_CACHE_SIZE")
     database_url: AnyUrl = Field("sqlite:///./user.db", alias="DATABASE_URL")
     smtp_host: str = Field("localhost", alias="SMTP_HOST")
     smtp_port: int = Field(1025, alias="SMTP_PORT")
     smtp_user: str = Field("", alias="SMTP_USER")
     smtp_password: str = Field("", alias="SMTP_PASSWORD")
     cors_allow_origins: List[str] = Field(["*"], alias="CORS_ALLOW_ORIGINS")
+    log_sampling: str = Field("", alias="LOG_SAMPLING")
 
     model_config = SettingsConfigDict(
         env_file=".env",
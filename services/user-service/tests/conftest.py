@@ -13,6 +13,9 @@ import pytest_asyncio
 from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient
 
+# The shared ``servicekit`` package sits next to the service directories.
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
 
 @pytest_asyncio.fixture(scope="function")
 async def client(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[AsyncClient]:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pytest
+from prometheus_client import REGISTRY
 
 
 @pytest.mark.asyncio
@@ -8,3 +9,14 @@ async def test_healthz(client):
     res = await client.get("/healthz")
     assert res.status_code == 200
     assert res.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_pool_metrics_follow_the_current_engine(client):
+    from app.database import async_engine
+
+    labels = {"pool": "primary", "state": "checked_out"}
+    # The fixture imports a fresh app.database for every test.
+    async with async_engine.connect():
+        assert REGISTRY.get_sample_value("db_pool_connections", labels) == 1
+    assert REGISTRY.get_sample_value("db_pool_connections", labels) == 0